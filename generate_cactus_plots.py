@@ -3,5 +3,5 @@
 from z3_noodler_eval import *
 
 if __name__ == "__main__":
-    generate_requested_cactus_plots()
+    generate_requested_cactus_plots(dfs)
 
@@ -0,0 +1,38 @@
+"""Tests of z3_noodler_cli.py on synthetic results (see z3_noodler_synthetic.py)"""
+
+import contextlib
+import io
+
+import z3_noodler_cli
+import z3_noodler_eval
+from z3_noodler_synthetic import generate_benchmarks
+
+
+def run_cli(tmp_path, monkeypatch, *argv):
+    """Run the CLI on synthetic results in tmp_path, returns the benchmarks of the files read by read_file()"""
+    if not (tmp_path / "results").exists():
+        generate_benchmarks(tmp_path / "results", 200, len(z3_noodler_cli.Tool) - 1)
+    read_files = []
+    read_file = z3_noodler_eval.read_file
+
+    def counting_read_file(filename, *args, **kwargs):
+        read_files.append(filename.parent.name)
+        return read_file(filename, *args, **kwargs)
+
+    monkeypatch.setattr(z3_noodler_eval, "read_file", counting_read_file)
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        z3_noodler_cli.main(["--results-dir", str(tmp_path / "results"), "--output-dir", str(tmp_path / "out"),
+                             "--jobs", "1", "--no-store", *argv])
+    return read_files
+
+
+def test_tables_of_one_benchmark_read_only_its_file(tmp_path, monkeypatch):
+    assert run_cli(tmp_path, monkeypatch, "tables", "--evaluations", "slog") == ["slog"]
+
+
+def test_watch_only_tails_files(tmp_path, monkeypatch):
+    assert run_cli(tmp_path, monkeypatch, "watch", "--evaluations", "all", "quick", "--refreshes", "1") == []
+    assert not list((tmp_path / "results").glob(f"*/*{z3_noodler_eval.READ_FILE_CACHE_SUFFIX}"))
+    # Tables of partial results do not overwrite those of the publication pipeline.
+    assert (tmp_path / "out" / "tables_watch" / "table1-all.tex").exists()
+    assert not list((tmp_path / "out" / "tables").iterdir())
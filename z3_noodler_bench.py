@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""z3_noodler_bench.py
+
+Time the analysis pipeline on synthetic results of growing sizes (see z3_noodler_synthetic.py).
+
+Measured stages are reading one result file (read_file() without cache), loading all benchmarks (create_dfs() with
+warm read_file() caches), generating the tables of an evaluation of all benchmarks (gen_evaluation() without scatter
+plots) and generating cactus plot data (generate_cactus_plot_csvs()). Timings can be saved as JSON and compared with
+a saved run, e.g. of another commit.
+"""
+
+import argparse
+import tempfile
+
+import z3_noodler_eval
+from z3_noodler_synthetic import *
+
+BENCH_SIZES = [1_000, 10_000, 100_000, 1_000_000]  # Numbers of instances.
+BENCH_TOOLS = [len(SYNTHETIC_TOOLS), 24]  # Numbers of tools.
+BENCH_REPEAT = 3  # Runs of each stage, the fastest is reported.
+
+
+def best_time(function, repeat=BENCH_REPEAT):
+    """Fastest wall time of repeat calls of function"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_stages(folder, num_instances, num_tools, repeat=BENCH_REPEAT):
+    """Time stages of the pipeline on synthetic results generated into folder, returns a dict stage -> seconds"""
+    files = generate_benchmarks(folder, num_instances, num_tools)
+    z3_noodler_eval.OUTPUT_PATH = pathlib.Path(folder)
+    for output_folder in ["tables", "csvs"]:
+        (pathlib.Path(folder) / output_folder).mkdir(exist_ok=True)
+
+    largest_file = max(files, key=lambda file: file.stat().st_size)
+    dfs, df_all, _, _ = create_dfs(files, Tool.noodler, Tool.noodler_underapprox)
+    other_tools = [Tool.cvc5, Tool.z3, Tool.z3_str_re, Tool.z3_trau, Tool.z3_str_4, Tool.ostrich]
+    cactus_params = dict(tools_to_print=[Tool.noodler_common] + other_tools[:4],
+                         tools_for_virtual_best_solver=other_tools[:4],
+                         tools_for_virtual_best_solver_improvement=[Tool.noodler_common],
+                         benchmarks=Benchmark.items(), csv_file_name="bench")
+
+    def gen_tables():
+        with contextlib.redirect_stdout(io.StringIO()):
+            gen_evaluation(df_all, Tool.noodler_common, [Tool.noodler_common] + other_tools, benchmark_name="bench",
+                           scatter=False)
+
+    return {
+        "read_file": best_time(lambda: read_file(largest_file, use_cache=False), repeat),
+        "create_dfs": best_time(lambda: create_dfs(files, Tool.noodler, Tool.noodler_underapprox), repeat),
+        "gen_evaluation_tables": best_time(gen_tables, repeat),
+        "generate_cactus_plot_csvs": best_time(lambda: generate_cactus_plot_csvs(dfs, **cactus_params), repeat),
+    }
+
+
+def run_benchmarks(sizes=BENCH_SIZES, tool_counts=BENCH_TOOLS, repeat=BENCH_REPEAT):
+    """Time stages for all sizes and numbers of tools, returns a list of result rows"""
+    rows = []
+    for num_tools in tool_counts:
+        for num_instances in sizes:
+            with tempfile.TemporaryDirectory() as folder:
+                timings = bench_stages(folder, num_instances, num_tools, repeat)
+            for stage, seconds in timings.items():
+                rows.append(dict(stage=stage, instances=num_instances, tools=num_tools, seconds=seconds))
+                print(f"{stage:>26} {num_instances:>9} instances {num_tools:>3} tools: {seconds:8.3f} s",
+                      file=sys.stderr)
+    return rows
+
+
+def compare_benchmarks(rows, baseline_rows):
+    """Table of rows with their baseline times and speedups"""
+    key = ["stage", "instances", "tools"]
+    df = pd.DataFrame(rows).merge(pd.DataFrame(baseline_rows), on=key, how="left", suffixes=("", "_baseline"))
+    df["speedup"] = df["seconds_baseline"] / df["seconds"]
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the analysis pipeline on synthetic results.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=BENCH_SIZES,
+                        help="numbers of instances (default: %(default)s)")
+    parser.add_argument("--tools", type=int, nargs="+", default=BENCH_TOOLS,
+                        help="numbers of tools (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=BENCH_REPEAT,
+                        help="runs of each stage, the fastest is reported (default: %(default)s)")
+    parser.add_argument("--save", metavar="JSON", help="save timings to a JSON file")
+    parser.add_argument("--compare", metavar="JSON", help="compare timings with a JSON file saved by --save")
+    args = parser.parse_args()
+    if min(args.tools) < len(SYNTHETIC_TOOLS):
+        parser.error(f"--tools must be at least {len(SYNTHETIC_TOOLS)}")
+
+    rows = run_benchmarks(args.sizes, args.tools, args.repeat)
+    if args.save is not None:
+        with open(args.save, "w") as save_file:
+            json.dump(rows, save_file, indent=1)
+    df = pd.DataFrame(rows)
+    if args.compare is not None:
+        with open(args.compare) as baseline_file:
+            df = compare_benchmarks(rows, json.load(baseline_file))
+    print(tab.tabulate(df, headers="keys", tablefmt="github", showindex=False, floatfmt=".3f"))
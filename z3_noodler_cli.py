@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+"""z3_noodler_cli.py
+
+Command-line driver generating selected outputs of Z3-Noodler experiments.
+
+Examples:
+    ./z3_noodler_cli.py tables --evaluations all quick
+    ./z3_noodler_cli.py tables --statistics statistics_tables
+    ./z3_noodler_cli.py tables --evaluations all --bootstrap 10000
+    ./z3_noodler_cli.py tables --evaluations all --no-exact-quantiles
+    ./z3_noodler_cli.py --store tables --evaluations all
+    ./z3_noodler_cli.py tables --benchmarks slog slent --main-tool noodler --tools noodler cvc5 z3
+    ./z3_noodler_cli.py scatter --evaluations all --jobs 4
+    ./z3_noodler_cli.py cactus --plots mult_virtual_all_no_ostrich_trau_improvement_noodler_start_26k_not_logarithmic
+    ./z3_noodler_cli.py running-longer --benchmarks kaluza --tool noodler_underapprox --threshold 50
+    ./z3_noodler_cli.py regressions --old-tool noodler --new-tools noodler_underapprox
+    ./z3_noodler_cli.py regressions --new-data-file to120_0123abc.csv --new-tools z3-noodler-0123abc
+    ./z3_noodler_cli.py watch --evaluations all quick --interval 300
+    ./z3_noodler_cli.py --data-file to120_nonmembership.csv --output-dir regex sanity
+    ./z3_noodler_cli.py --data-file to120_nonmembership.csv --output-dir regex tables --benchmarks regex
+"""
+
+import argparse
+
+import z3_noodler_eval
+from z3_noodler_eval import *
+from z3_noodler_stream import (WATCH_INTERVAL, WATCH_STATISTICS_FILE_NAME, WATCH_TABLES_FOLDER, WatchedEvaluations,
+                               watch_evaluations)
+
+
+def parse_tool(text):
+    """Tool given by its name (e.g. noodler_common) or value (e.g. z3-noodler-common)"""
+    for tool in Tool.items():
+        if text in (tool.name, tool.value):
+            return tool
+    raise argparse.ArgumentTypeError(f"unknown tool {text!r}, choose from {', '.join(Tool.names())}")
+
+
+def parse_build_tool(text):
+    """Tool given by its name or value, or any other tool name of result columns (e.g. z3-noodler-0123abc)"""
+    try:
+        return parse_tool(text)
+    except argparse.ArgumentTypeError:
+        return text
+
+
+def data_file_variant(data_file):
+    """Result variant (see requested_variants()) of results in data_file, None for other data files"""
+    return next((variant for variant in requested_variants() if variant.data_file_name == data_file), None)
+
+
+def result_files(args):
+    """Result files of --data-file and whether runtimes of unknown results are masked
+
+    Results of a result variant are read from its benchmarks with its masking, other data files from all folders of
+    --results-dir containing them (Benchmark folders first). --mask-unknown overrides the masking.
+    """
+    variant = data_file_variant(args.data_file)
+    if variant is not None:
+        benchmarks, mask_unknown = variant.benchmarks, variant.mask_unknown
+    else:
+        folders = sorted(folder.name for folder in args.results_dir.iterdir() if (folder / args.data_file).is_file())
+        benchmarks = list(ordered_benchmarks(folders).sort_values())
+        mask_unknown = False
+    if args.mask_unknown is not None:
+        mask_unknown = args.mask_unknown
+    return [args.results_dir / benchmark / args.data_file for benchmark in benchmarks], mask_unknown
+
+
+def selected_evaluations(args, files):
+    """Evaluations selected by --evaluations, or a single evaluation of --benchmarks
+
+    Requested evaluations are those of the result variant of --data-file, requested_evaluations() of benchmarks with
+    result files (files maps benchmark names to them, e.g. Dataset.files) for other data files. No file is read.
+    """
+    if args.benchmarks is None:
+        variant = data_file_variant(args.data_file)
+        if variant is not None and variant.evaluations is not None:
+            evaluations = variant.evaluations
+        else:
+            evaluations = [evaluation for evaluation in requested_evaluations()
+                           if all(benchmark in files for benchmark in evaluation.benchmarks)]
+        if args.evaluations is not None:
+            unknown = set(args.evaluations) - {evaluation.name for evaluation in evaluations}
+            if unknown:
+                raise SystemExit(f"Unknown evaluations: {', '.join(sorted(unknown))}.")
+            evaluations = [evaluation for evaluation in evaluations if evaluation.name in args.evaluations]
+        return evaluations
+
+    main_tool = args.main_tool
+    if main_tool is None:
+        underapprox = all(benchmark in UNDERAPPROX_BENCHMARKS for benchmark in args.benchmarks)
+        main_tool = Tool.noodler_underapprox if underapprox else Tool.noodler
+    other_tools = [Tool.cvc5, Tool.z3, Tool.z3_str_re, Tool.z3_trau, Tool.z3_str_4, Tool.ostrich]
+    tools = args.tools or [main_tool] + other_tools
+    if main_tool not in tools:
+        tools = [main_tool] + tools
+    name = args.name or "_".join(args.benchmarks)
+    return [Evaluation(name, args.benchmarks, main_tool, tools)]
+
+
+def run_tables(dataset, args):
+    z3_noodler_eval.BOOTSTRAP_RESAMPLES = args.bootstrap
+    z3_noodler_eval.EXACT_QUANTILES = args.exact_quantiles
+    evaluations = selected_evaluations(args, dataset.files)
+    dataset.load({benchmark for evaluation in evaluations for benchmark in evaluation.benchmarks}, jobs=args.jobs)
+    statistics = {}
+    gen_requested_evaluations(dataset, evaluations=evaluations, scatter=False, statistics=statistics)
+    if args.statistics is not None:
+        gen_statistics_files(statistics, args.statistics)
+
+
+def run_scatter(dataset, args):
+    evaluations = selected_evaluations(args, dataset.files)
+    dataset.load({benchmark for evaluation in evaluations for benchmark in evaluation.benchmarks}, jobs=args.jobs)
+    with RenderQueue(jobs=args.jobs) as render_queue:
+        gen_requested_evaluations(dataset, render_queue, evaluations=evaluations, tables=False)
+
+
+def run_vbs(dataset, args):
+    benchmarks = args.benchmarks or list(dataset)
+    tools = args.tools or requested_vbs_evaluations()[0][2]
+    dataset.load(benchmarks, jobs=args.jobs)
+    gen_vbs_evaluation(dataset.concat(benchmarks), tools, args.name or "_".join(benchmarks))
+
+
+def run_cactus(dataset, args):
+    # Requested cactus plots are of result variants without their own evaluations (to120) or of other data files.
+    variant = data_file_variant(args.data_file)
+    names = []
+    if variant is None or variant.evaluations is None:
+        names = [plot_params['file_name'] for csv_params, plot_params in requested_cactus_plots()
+                 if all(benchmark.value in dataset.files for benchmark in csv_params['benchmarks'])
+                 and (args.plots is None or plot_params['file_name'] in args.plots)]
+    if not names:
+        raise SystemExit(f"No requested cactus plots{' of ' + ', '.join(args.plots) if args.plots else ''} "
+                         f"for {args.data_file} results of benchmarks {', '.join(dataset.files)}.")
+    generate_requested_cactus_plots(dataset, names=names)
+
+
+def run_running_longer(dataset, args):
+    benchmarks = args.benchmarks or list(dataset)
+    dataset.load(benchmarks, jobs=args.jobs)
+    df = get_running_longer(dataset.concat(benchmarks), args.tool, args.threshold, include_nan=not args.exclude_nan)
+    for name in df["name"]:
+        print(name)
+
+
+def run_regressions(dataset, args):
+    benchmarks = args.benchmarks or list(dataset)
+    dataset.load(benchmarks, jobs=args.jobs)
+    df_old = dataset.concat(benchmarks)
+    df_new = None
+    if args.new_data_file is not None:
+        df_new = read_build_results([args.results_dir / benchmark / args.new_data_file for benchmark in benchmarks],
+                                    dataset.mask_unknown)
+    old_name = getattr(args.old_tool, "value", args.old_tool)
+    for new_tool in args.new_tools or [args.old_tool]:
+        new_name = getattr(new_tool, "value", new_tool)
+        name = f"{old_name}_vs_{new_name}"
+        if df_new is not None:
+            name += "_" + pathlib.Path(args.new_data_file).stem
+        report = regression_report(df_old, args.old_tool, df_new, new_tool, args.relative, args.absolute)
+        gen_regression_report(report, name, args.top)
+
+
+def run_watch(dataset, args):
+    # Files are only tailed, the dataset does not read (and cache) them while they are appended to.
+    watched = WatchedEvaluations(list(dataset.files.values()), selected_evaluations(args, dataset.files),
+                                 dataset.noodler_version, dataset.noodler_underapprox_version, dataset.mask_unknown)
+    with contextlib.suppress(KeyboardInterrupt):
+        watch_evaluations(watched, args.interval, args.refreshes, args.statistics, args.tables_folder)
+
+
+def run_sanity(dataset, args):
+    benchmarks = args.benchmarks or list(dataset)
+    dataset.load(benchmarks, jobs=args.jobs)
+    df = gen_sanity_report(dataset.concat(benchmarks), args.name or "_".join(benchmarks))
+    print(tab.tabulate(df, headers="keys", tablefmt="github", showindex=False))
+
+
+def argument_parser():
+    parser = argparse.ArgumentParser(description="Generate selected outputs of Z3-Noodler experiments.")
+    parser.add_argument("--results-dir", type=pathlib.Path, default=BENCHMARKS_FOLDER_PATH,
+                        help="directory with a folder of results per benchmark (default: %(default)s)")
+    parser.add_argument("--data-file", default=BENCHMARKS_DATA_FILE_NAME,
+                        help="name of the result file of each benchmark, read from the benchmarks of its result "
+                             "variant or from all folders containing it (default: %(default)s)")
+    parser.add_argument("--mask-unknown", action=argparse.BooleanOptionalAction,
+                        help="mask runtimes of unknown results as runtimes of errors and timeouts (default: as the "
+                             "result variant of the data file)")
+    parser.add_argument("--output-dir", type=pathlib.Path, default=OUTPUT_PATH,
+                        help="directory to write the tables, graphs and csvs folders to (default: %(default)s)")
+    parser.add_argument("--jobs", type=int, default=JOBS,
+                        help="number of worker processes reading files and rendering plots (default: one per CPU)")
+    parser.add_argument("--store", action=argparse.BooleanOptionalAction, default=RESULTS_STORE,
+                        help="map results of all benchmarks from one memory-mapped results store next to the "
+                             "benchmark folders (default: %(default)s)")
+    parser.add_argument("--profile", metavar="REPORT", default=INSTRUMENTATION_REPORT,
+                        help="write a JSON report of time and memory of pipeline stages and print their summary")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_selection(subparser, evaluations=True, tools=True):
+        subparser.add_argument("--benchmarks", nargs="+", metavar="BENCHMARK",
+                               help="benchmarks of the data file to evaluate together (e.g. slog slent, regex)")
+        if evaluations:
+            subparser.add_argument("--evaluations", nargs="+", metavar="NAME",
+                                   help="requested evaluations to generate when no benchmarks are given (default: all)")
+            subparser.add_argument("--main-tool", type=parse_tool, help="main tool of the benchmarks' evaluation")
+        if tools:
+            subparser.add_argument("--tools", nargs="+", type=parse_tool, metavar="TOOL",
+                                   help=f"tools to compare ({', '.join(Tool.names())})")
+            subparser.add_argument("--name", help="name of the benchmarks' evaluation in output files")
+
+    tables = subparsers.add_parser("tables", help="print statistics and write tables")
+    add_selection(tables)
+    tables.add_argument("--bootstrap", type=int, default=BOOTSTRAP_RESAMPLES, metavar="RESAMPLES",
+                        help="add bootstrap confidence intervals from RESAMPLES resamples (default: %(default)s, none)")
+    tables.add_argument("--statistics", metavar="NAME",
+                        help="write statistics of the evaluations to NAME.json and NAME.parquet in the output directory")
+    tables.add_argument("--exact-quantiles", action=argparse.BooleanOptionalAction, default=EXACT_QUANTILES,
+                        help="compute runtime percentiles by sorting runtimes instead of merging runtime histograms "
+                             "(default: %(default)s)")
+    tables.set_defaults(run=run_tables)
+
+    scatter = subparsers.add_parser("scatter", help="render scatter plots")
+    add_selection(scatter)
+    scatter.set_defaults(run=run_scatter)
+
+    vbs = subparsers.add_parser("vbs", help="print and write the virtual best solvers table")
+    add_selection(vbs, evaluations=False)
+    vbs.set_defaults(run=run_vbs)
+
+    cactus = subparsers.add_parser("cactus", help="write cactus plot data and graphs")
+    cactus.add_argument("--plots", nargs="+", metavar="NAME",
+                        help="graph file names of requested cactus plots to generate (default: all)")
+    cactus.set_defaults(run=run_cactus)
+
+    running_longer = subparsers.add_parser("running-longer", help="print names of instances running longer")
+    add_selection(running_longer, evaluations=False, tools=False)
+    running_longer.add_argument("--tool", type=parse_tool, default=Tool.noodler, help="tool (default: noodler)")
+    running_longer.add_argument("--threshold", type=float, default=TIMEOUT,
+                                help="runtime threshold in seconds (default: %(default)s)")
+    running_longer.add_argument("--exclude-nan", action="store_true", help="skip instances without a runtime")
+    running_longer.set_defaults(run=run_running_longer)
+
+    regressions = subparsers.add_parser("regressions", help="print and write per-instance changes between builds")
+    add_selection(regressions, evaluations=False, tools=False)
+    regressions.add_argument("--old-tool", type=parse_build_tool, default=Tool.noodler,
+                             help="tool of the old build (default: noodler)")
+    regressions.add_argument("--new-tools", nargs="+", type=parse_build_tool, metavar="TOOL",
+                             help="tools of new builds compared with the old one (default: the old tool)")
+    regressions.add_argument("--new-data-file",
+                             help="name of the result file of each benchmark with results of new builds (default: "
+                                  "the data file)")
+    regressions.add_argument("--relative", type=float, default=REGRESSION_RELATIVE_THRESHOLD,
+                             help="relative runtime change of slowdowns and speedups (default: %(default)s)")
+    regressions.add_argument("--absolute", type=float, default=REGRESSION_ABSOLUTE_THRESHOLD,
+                             help="runtime change in seconds of slowdowns and speedups (default: %(default)s)")
+    regressions.add_argument("--top", type=int, default=REGRESSION_TOP,
+                             help="number of changes printed (default: %(default)s)")
+    regressions.set_defaults(run=run_regressions)
+
+    watch = subparsers.add_parser("watch", help="refresh statistics and tables while result files are appended to")
+    add_selection(watch)
+    watch.add_argument("--interval", type=float, default=WATCH_INTERVAL,
+                       help="seconds between refreshes (default: %(default)s)")
+    watch.add_argument("--refreshes", type=int, help="stop after this many refreshes (default: until interrupted)")
+    watch.add_argument("--statistics", default=WATCH_STATISTICS_FILE_NAME,
+                       help="name of the refreshed statistics file, also written as .json and .parquet "
+                            "(default: %(default)s)")
+    watch.add_argument("--tables-folder", default=WATCH_TABLES_FOLDER,
+                       help="folder of the output directory with the refreshed tables (default: %(default)s)")
+    watch.set_defaults(run=run_watch)
+
+    sanity = subparsers.add_parser("sanity", help="print and write instances where tools answer both sat and unsat")
+    add_selection(sanity, evaluations=False, tools=False)
+    sanity.add_argument("--name", help="name of the report in csvs/sanity-<name>.csv (default: the benchmarks)")
+    sanity.set_defaults(run=run_sanity)
+
+    return parser
+
+
+def main(argv=None):
+    parser = argument_parser()
+    args = parser.parse_args(argv)
+
+    z3_noodler_eval.OUTPUT_PATH = args.output_dir
+    for folder in ["tables", "graphs", "csvs"]:
+        (args.output_dir / folder).mkdir(parents=True, exist_ok=True)
+
+    files, mask_unknown = result_files(args)
+    dataset = Dataset(files, Tool.noodler, Tool.noodler_underapprox, mask_unknown, store=args.store)
+    unknown = [benchmark for benchmark in getattr(args, "benchmarks", None) or [] if benchmark not in dataset.files]
+    if unknown:
+        parser.error(f"no {args.data_file} results of benchmarks {', '.join(unknown)} "
+                     f"(choose from {', '.join(dataset)})")
+    if args.profile is not None:
+        instrumentation.start()
+    args.run(dataset, args)
+    if instrumentation.enabled:
+        instrumentation.stop()
+        instrumentation.save_report(args.profile)
+        print(instrumentation.summary(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
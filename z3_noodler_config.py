@@ -8,6 +8,16 @@ import enum
 TIMEOUT = 120  # In seconds.
 TIMEOUT_VAL = TIMEOUT * 1.1
 TIME_MIN = 0.01
+JOBS = None  # Number of worker processes for parallel work, None for the number of CPUs.
+RESULTS_STORE = False  # Map results of all benchmarks from one Arrow file (see Dataset), shared by processes.
+INCREMENTAL_BUILD = False  # Regenerate only outputs whose inputs changed since the last build.
+# Compute runtime percentiles by sorting runtimes. False merges runtime histograms of benchmarks instead, percentiles
+# are then off by at most 0.005 s below TIMEOUT_VAL and reported as the largest runtime above it (off by at most the
+# distance of the largest runtime to TIMEOUT_VAL).
+EXACT_QUANTILES = True
+BOOTSTRAP_RESAMPLES = 0  # Resamples of bootstrap confidence intervals in evaluation tables (e.g. 10_000), 0 to disable.
+RESULT_VARIANTS = ["to120"]  # Result variants evaluated by z3_noodler_eval.py, e.g. ["to120", "regex"].
+INSTRUMENTATION_REPORT = None  # Path of a JSON report of time and memory of pipeline stages, None to disable.
 
 
 class ExtendedEnum(enum.Enum):
@@ -4,15 +4,26 @@
 
 Generate tables and graphs for Z3-Noodler experiments.
 """
+import collections.abc
+import concurrent.futures
 import contextlib
 import datetime
+import hashlib
+import io
 import itertools
+import json
 import pathlib
 import enum
+import functools
+import os
 import sys
+import time
+import tracemalloc
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import re as re
 import seaborn as sns
 
@@ -22,6 +33,7 @@ import plotnine as p9
 import matplotlib as mplt
 import math
 import mizani.formatters as mizani
+import mizani.palettes as mizani_palettes
 import warnings
 
 from z3_noodler_config import *
@@ -30,16 +42,73 @@ warnings.filterwarnings('ignore')
 
 BENCHMARKS_FOLDER_PATH = pathlib.Path("../smt-string-bench-results/")
 BENCHMARKS_DATA_FILE_NAME = "to120.csv"
+READ_FILE_CACHE_SUFFIX = ".cache.parquet"
+READ_FILE_CACHE_KEY_FIELD = b"read_file_cache_key"
+READ_FILE_CACHE_VERSION = 2  # Bump whenever the normalization in _parse_file() changes.
+RESULTS_STORE_SUFFIX = ".store.arrow"
+RESULTS_STORE_KEY_FIELD = b"results_store_key"
+RESULTS_STORE_OFFSETS_FIELD = b"results_store_offsets"
+RESULT_DTYPE = pd.CategoricalDtype(['sat', 'unsat', 'unknown', 'TO', 'ERR'])
+RUNTIME_DTYPE = np.float32
+UNDERAPPROX_BENCHMARKS = ["kaluza"]
+OUTPUT_PATH = pathlib.Path(".")  # Directory with statistics and the tables, graphs and csvs folders.
+BUILD_MANIFEST_PATH = pathlib.Path(".build_manifest.json")  # Relative to OUTPUT_PATH.
+PLOT_DPI = 1000
+SCATTER_PLOT_SIZE = 8
+SCATTER_PLOT_BACKEND = "plotnine"  # Or "matplotlib" to draw scatter plots directly, without plotnine.
+SCATTER_PLOT_RASTERIZE = False  # Rasterize points and rugs of scatter plots (axes, text and lines stay vector).
+SCATTER_PLOT_RASTER_DPI = 300  # Resolution of rasterized layers.
+CACTUS_PLOT_THIN_TOLERANCE = None  # E.g. 1e-3 to keep cactus plot points within 0.1 % of the plot height.
+CACTUS_PLOT_FORMAT = "csv"  # Or "parquet" for compressed binary cactus plot data.
+TABLE_FORMATS = ["latex", "markdown", "csv"]  # Formats of tables written by table_to_file().
+TABLE_FORMAT_SUFFIXES = {"latex": ".tex", "markdown": ".md", "csv": ".csv"}
+# Runtime quantiles of summary statistics, median and tail percentiles.
+SUMMARY_QUANTILES = {"median": 0.5, "p90": 0.9, "p95": 0.95, "p99": 0.99, "p99.9": 0.999}
+QUANTILE_RESOLUTION = 0.01  # Runtime resolution of runtime histograms (quantile sketches) in seconds.
+BOOTSTRAP_CONFIDENCE = 0.95  # Confidence level of bootstrap confidence intervals.
+BOOTSTRAP_SEED = 0  # Seed of bootstrap resampling, fixed for reproducible tables.
+BOOTSTRAP_BATCH_SIZE = 1 << 22  # Instances drawn at once (resamples x instances) when bootstrapping.
+REGRESSION_RELATIVE_THRESHOLD = 0.1  # Runtime changes of less than 10 % are not reported as slowdowns/speedups.
+REGRESSION_ABSOLUTE_THRESHOLD = 0.5  # Runtime changes of less than 0.5 s are not reported as slowdowns/speedups.
+REGRESSION_TOP = 20  # Changes printed by gen_regression_report().
+# Kinds of per-instance changes between builds in the order they are ranked, regressions first.
+REGRESSION_CHANGES = ["result_flip", "new_timeout", "lost_solve", "slowdown", "speedup", "new_solve"]
 FILES = [BENCHMARKS_FOLDER_PATH / benchmark_name / BENCHMARKS_DATA_FILE_NAME for benchmark_name in Benchmark.values()]
 
+def output_path(*parts):
+    """Path of an output file in OUTPUT_PATH"""
+    return str(OUTPUT_PATH.joinpath(*parts))
+
+
 def get_powerset(iterable):
     s = list(iterable)
     return itertools.chain.from_iterable(itertools.combinations(s, r) for r in range(1, len(s) + 1))
 
 
 # For reading in files
-def read_file(filename):
-    """Reads a CSV file into Panda's data frame"""
+def normalize_results(results):
+    """Normalizes raw tool results to RESULT_DTYPE, unexpected (and missing) results become 'ERR'"""
+    # Strip and validate each distinct value only once instead of every row.
+    codes, uniques = pd.factorize(results)
+    unique_codes = pd.Categorical(pd.Index(uniques, dtype=object).str.strip(), dtype=RESULT_DTYPE).codes
+    unique_codes = np.append(unique_codes, -1)  # Missing values have code -1 in codes.
+    err_code = RESULT_DTYPE.categories.get_loc('ERR')
+    result_codes = np.where(unique_codes == -1, err_code, unique_codes).astype(np.int8)[codes]
+    return pd.Categorical.from_codes(result_codes, dtype=RESULT_DTYPE)
+
+
+def widen_runtimes(runtimes):
+    """Widens float32 runtimes to float64 keeping their shortest decimal representation (0.27, not 0.2700000107)
+
+    Aggregations and comparisons against TIMEOUT_VAL/TIME_MIN are done on widened runtimes.
+    """
+    runtimes = pd.Series(runtimes)
+    codes, uniques = pd.factorize(runtimes.to_numpy(dtype=np.float32), use_na_sentinel=False)
+    return pd.Series(uniques.astype(str).astype(np.float64)[codes], index=runtimes.index, name=runtimes.name)
+
+
+def _parse_file(filename, mask_unknown=False):
+    """Parses a CSV file into Panda's data frame and normalizes results and runtimes"""
     df_loc = pd.read_csv(
         filename,
         sep=";",
@@ -47,64 +116,208 @@ def read_file(filename):
         #na_values=['ERR', 'TO', 'MISSING'],
         #na_values=['TO'],
         )
+    return normalize_frame(df_loc, mask_unknown)
+
+
+def normalize_frame(df_loc, mask_unknown=False):
+    """Normalizes results and runtimes of a raw results data frame (in place)
 
+    Results are stored as RESULT_DTYPE categoricals, runtimes as float32 (NaN for errors and timeouts, and for unknown
+    results with mask_unknown) and instance names are dictionary-encoded.
+    """
     for col in df_loc.columns:
         if re.search(r"-result$", col):
-            df_loc[col] = df_loc[col].apply(lambda x: x.strip())
-            df_loc.loc[~df_loc[col].isin(['sat', 'unsat', 'unknown', 'TO']), col] = 'ERR'
+            df_loc[col] = normalize_results(df_loc[col])
 
+    mask_runtimes(df_loc, ['ERR', 'TO', 'unknown'] if mask_unknown else ['ERR', 'TO'])
+    df_loc["name"] = df_loc["name"].astype("category")
+
+    return df_loc
+
+
+def mask_runtimes(df_loc, results):
+    """Sets runtimes of tools with one of results to NaN and stores runtimes as float32 (in place)"""
+    masked_codes = RESULT_DTYPE.categories.get_indexer(results)
     for col in df_loc.columns:
         if re.search(r"-runtime$", col):
             [tool_name, _] = col.rsplit('-', 1)
             tool_result_name = f"{tool_name}-result"
-            #df_loc.loc[df_loc[tool_result_name].isin(['ERR', 'TO', 'unknown']), col] = np.nan
-            df_loc.loc[df_loc[tool_result_name].isin(['ERR', 'TO']), col] = np.nan
-            df_loc[col] = df_loc[col].astype(float)
-
+            masked = np.isin(df_loc[tool_result_name].cat.codes, masked_codes)
+            # Mask before casting, runtimes of masked results need not be numbers (e.g. "TO").
+            df_loc[col] = df_loc[col].mask(masked).astype(RUNTIME_DTYPE)
     return df_loc
 
 
-# For printing scatter plots
-def scatter_plot(df, xcol, ycol, domain, xname=None, yname=None, log=False, width=6, height=6, clamp=True, tickCount=5, show_legend=False):
-    assert len(domain) == 2
+def read_file_cache_path(filename):
+    """Path of the columnar cache kept next to a results CSV file"""
+    filename = pathlib.Path(filename)
+    return filename.with_name(f"{filename.name}{READ_FILE_CACHE_SUFFIX}")
+
 
-    POINT_SIZE = 5
-    DASH_PATTERN = (0, (6, 2))
+@functools.lru_cache(maxsize=None)
+def _file_hash(filename, size, mtime_ns):
+    content_hash = hashlib.sha256()
+    with open(filename, "rb") as fl:
+        for block in iter(lambda: fl.read(1 << 20), b""):
+            content_hash.update(block)
+    return content_hash.hexdigest()
 
+
+def file_hash(filename):
+    """SHA-256 hash of the content of a file, memoized while the file's size and mtime stay the same"""
+    stat = pathlib.Path(filename).stat()
+    return _file_hash(str(filename), stat.st_size, stat.st_mtime_ns)
+
+
+def read_file_cache_key(filename):
+    """Cache key of a results CSV file: its size, mtime and content hash"""
+    stat = pathlib.Path(filename).stat()
+    return f"v{READ_FILE_CACHE_VERSION}:{stat.st_size}:{stat.st_mtime_ns}:{file_hash(filename)}"
+
+
+def read_file(filename, use_cache=True, mask_unknown=False):
+    """Reads a CSV file into Panda's data frame
+
+    The normalized data frame is cached in a Parquet file next to the CSV file and reused as long as the size,
+    mtime and content of the CSV file stay the same. With mask_unknown, runtimes of unknown results are NaN too. They
+    are masked after reading, so the cache is shared by both masking policies.
+    """
+    if not use_cache:
+        return _parse_file(filename, mask_unknown)
+    df_loc = _read_file_cached(filename)
+    return mask_runtimes(df_loc, ['unknown']) if mask_unknown else df_loc
+
+
+def _read_file_cached(filename):
+    cache_path = read_file_cache_path(filename)
+    cache_key = read_file_cache_key(filename)
+    with contextlib.suppress(OSError, pa.ArrowException):
+        if (pq.read_schema(cache_path).metadata or {}).get(READ_FILE_CACHE_KEY_FIELD, b"").decode() == cache_key:
+            return pq.read_table(cache_path).to_pandas()
+
+    df_loc = _parse_file(filename)
+    table = pa.Table.from_pandas(df_loc, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), READ_FILE_CACHE_KEY_FIELD: cache_key})
+    # Write to a temporary file first so that concurrent readers never see a partially written cache.
+    tmp_cache_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        pq.write_table(table, tmp_cache_path)
+        os.replace(tmp_cache_path, cache_path)
+    except OSError as e:
+        print(f"Cannot write cache {cache_path}: {e}", file=sys.stderr)
+        with contextlib.suppress(OSError):
+            tmp_cache_path.unlink()
+
+    return df_loc
+
+
+# For printing scatter plots
+SCATTER_POINT_SIZE = 5
+SCATTER_DASH_PATTERN = (0, (6, 2))
+SCATTER_LEGEND_WIDTH = 2.3  # Width added to scatter plots for the legend in inches.
+SCATTER_TOOL_NAMES = {
+    "cvc5": "cvc5",
+    "z3": "Z3",
+    "z3strRE": "Z3str3RE",
+    "z3-trau": "Z3-Trau",
+    "z3str4": "Z3str4",
+    "ostrich": "OSTRICH"
+}
+
+
+def scatter_plot_data(df, xcol, ycol, domain, xname=None, yname=None, clamp=True):
+    """Axis names and the data frame of a scatter plot (columns xcol, ycol and benchmark) with overflowing values
+    clamped and ordered benchmarks
+
+    Columns of df are shared, not copied, unless they are clamped or their benchmarks are not ordered yet (as in
+    scatter_plot_table()).
+    """
     if xname is None:
         xname = xcol
     if yname is None:
-        tool_names = {
-            "cvc5": "cvc5",
-            "z3": "Z3",
-            "z3strRE": "Z3str3RE",
-            "z3-trau": "Z3-Trau",
-            "z3str4": "Z3str4",
-            "ostrich": "OSTRICH"
-        }
-        yname = tool_names[ycol]
-
-    # formatter for axes' labels
-    ax_formatter = mizani.custom_format('{:n}')
+        yname = SCATTER_TOOL_NAMES[ycol]
 
+    x, y, benchmarks = df[xcol], df[ycol], scatter_plot_benchmarks(df['benchmark'])
     if clamp:  # clamp overflowing values if required
-        df = df.copy(deep=True)
-        df.loc[df[xcol] > domain[1], xcol] = domain[1]
-        df.loc[df[ycol] > domain[1], ycol] = domain[1]
+        x, y = x.clip(upper=domain[1]), y.clip(upper=domain[1])
 
-    df_ordered = df.assign(benchmark=pd.Categorical(df['benchmark'], Benchmark.values()))
+    df_ordered = pd.DataFrame({xcol: x, ycol: y, 'benchmark': benchmarks}, copy=False)
+    return xname, yname, df_ordered
+
+
+def scatter_plot_table(df, main_tool, tools, max_runtime=TIMEOUT_VAL):
+    """Compact table of the scatter plots of main_tool against tools: their runtime columns and ordered benchmarks
+    (see ordered_benchmarks()) of instances where main_tool does not return unknown
+
+    Missing runtimes are max_runtime, runtimes are floored at TIME_MIN (to remove 0 on log axes) and clamped at
+    max_runtime, so the plots use the table without clamping (and copying) it again. df is not modified.
+    """
+    known = (df[main_tool.value + "-result"] != "unknown").to_numpy()
+    table = {}
+    for tool in tools:
+        runtimes = widen_runtimes(df[tool.value + "-runtime"]).to_numpy()[known]
+        table[tool.value + "-runtime"] = np.clip(np.nan_to_num(runtimes, nan=max_runtime), TIME_MIN, max_runtime)
+    table["benchmark"] = ordered_benchmarks(df["benchmark"].to_numpy()[known])
+    return pd.DataFrame(table, copy=False)
+
+
+def ordered_benchmarks(benchmarks):
+    """Categorical of benchmarks ordered as Benchmark, followed by other benchmarks (e.g. regex) as they appear"""
+    others = [benchmark for benchmark in pd.Series(benchmarks, dtype=object).unique()
+              if benchmark not in Benchmark.values()]
+    return pd.Categorical(benchmarks, Benchmark.values() + others)
+
+
+def scatter_plot_benchmarks(benchmarks):
+    """Benchmarks of a scatter plot as the ordered categorical series which scatter_plot() maps to colours"""
+    if (isinstance(benchmarks.dtype, pd.CategoricalDtype)
+            and list(benchmarks.cat.categories[:len(Benchmark)]) == Benchmark.values()):
+        return benchmarks
+    return pd.Series(ordered_benchmarks(benchmarks), index=benchmarks.index)
+
+
+def scatter_plot_colors(benchmarks):
+    """Colours of benchmarks present in the ordered categorical benchmarks as in scatter_plot()
+
+    As plotnine's colour scale, the palette spans all categories (also benchmarks not present), so each benchmark
+    keeps its colour in every subset.
+    """
+    categories = benchmarks.cat.categories
+    palette = mizani_palettes.brewer_pal(type="qual", palette="Dark2", direction=-1)(len(categories))
+    colors = dict(zip(categories, palette))
+    return {benchmark: colors[benchmark] for benchmark in benchmarks.cat.remove_unused_categories().cat.categories}
+
+
+def scatter_plot_legend(fig, colors, **kwargs):
+    """Add the benchmark legend of a scatter plot with colors to the matplotlib figure fig"""
+    handles = [mplt.lines.Line2D([], [], linestyle="", marker="o", markersize=(SCATTER_POINT_SIZE + 0.5) * np.sqrt(np.pi),
+                                 color=color) for color in colors.values()]
+    return fig.legend(handles, colors.keys(), title="Benchmark", fontsize=20, title_fontsize=20, frameon=False,
+                      handlelength=1, handletextpad=0.2, borderaxespad=0.2, **kwargs)
+
+
+def scatter_plot(df, xcol, ycol, domain, xname=None, yname=None, log=False, width=6, height=6, clamp=True, tickCount=5, show_legend=False, raster=False):
+    assert len(domain) == 2
+
+    POINT_SIZE = SCATTER_POINT_SIZE
+    DASH_PATTERN = SCATTER_DASH_PATTERN
+
+    xname, yname, df_ordered = scatter_plot_data(df, xcol, ycol, domain, xname, yname, clamp)
+
+    # formatter for axes' labels
+    ax_formatter = mizani.custom_format('{:n}')
 
     # generate scatter plot
     scatter = p9.ggplot(df_ordered) \
         + p9.aes(x=xcol, y=ycol, color="benchmark") \
-        + p9.geom_point(size=POINT_SIZE, na_rm=True, show_legend=show_legend) \
+        + p9.geom_point(size=POINT_SIZE, na_rm=True, show_legend=show_legend, raster=raster) \
         + p9.labs(x=xname, y=yname) \
         + p9.theme(legend_key_width=2) \
         + p9.scale_color_brewer(type="qual", palette="Dark2", name="Benchmark", drop=True, direction=-1)
     # + p9.geom_jitter(width=0.2, height=0.2, size=POINT_SIZE) \
 
     # rug plots
-    scatter += p9.geom_rug(na_rm=True, sides="tr", alpha=0.05)
+    scatter += p9.geom_rug(na_rm=True, sides="tr", alpha=0.05, raster=raster)
 
     if log:  # log scale
         scatter += p9.scale_x_log10(limits=domain, labels=ax_formatter)
@@ -139,6 +352,341 @@ def scatter_plot(df, xcol, ycol, domain, xname=None, yname=None, log=False, widt
     return res
 
 
+def scatter_plot_matplotlib(df, xcol, ycol, domain, xname=None, yname=None, log=False, width=6, height=6, clamp=True, tickCount=5, show_legend=False, raster=False):
+    """scatter_plot() drawn directly with matplotlib, returns a matplotlib figure
+
+    Sizes, colours, rugs, rules and the theme follow scatter_plot(); only the tick positions may differ.
+    """
+    assert len(domain) == 2
+
+    xname, yname, df_ordered = scatter_plot_data(df, xcol, ycol, domain, xname, yname, clamp)
+    colors = scatter_plot_colors(df_ordered['benchmark'])
+    df_ordered = df_ordered.dropna(subset=[xcol, ycol])
+    point_colors = df_ordered['benchmark'].map(colors).astype(object).to_numpy()
+    x = df_ordered[xcol].to_numpy()
+    y = df_ordered[ycol].to_numpy()
+
+    # sizes in plotnine's units
+    size_factor = np.sqrt(np.pi)
+    stroke = 0.5
+    rug_length = 0.03
+
+    # the legend is placed right of the width x height plot
+    fig_width = width + SCATTER_LEGEND_WIDTH if show_legend else width
+    fig = mplt.figure.Figure(figsize=(fig_width, height), layout="constrained")
+    fig.get_layout_engine().set(rect=(0, 0, width / fig_width, 1))
+    ax = fig.add_subplot()
+    if log:  # log scale
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+    # expand limits by 5 % on each side (in the scale's space) as plotnine's continuous scales do
+    ax.set_xlim(domain)
+    scale_domain = (ax.transScale + ax.transLimits).inverted()
+    limits = scale_domain.transform([[-0.05, -0.05], [1.05, 1.05]])[:, 0]
+    ax.set_xlim(limits)
+    ax.set_ylim(limits)
+    ax_formatter = mplt.ticker.FuncFormatter(lambda value, _: '{:n}'.format(value))
+    ax.xaxis.set_major_formatter(ax_formatter)
+    ax.yaxis.set_major_formatter(ax_formatter)
+    ax.xaxis.set_minor_locator(mplt.ticker.NullLocator())
+    ax.yaxis.set_minor_locator(mplt.ticker.NullLocator())
+
+    # theme_bw() with major grid only
+    ax.set_axisbelow(True)
+    ax.grid(which='major', color='#666666', alpha=0.5)
+    ax.tick_params(labelsize=24, labelcolor="black")
+    ax.set_xlabel(xname, fontsize=24, color="black")
+    ax.set_ylabel(yname, fontsize=24, color="black")
+
+    points = ax.scatter(x, y, s=(SCATTER_POINT_SIZE + stroke) ** 2 * np.pi, c=point_colors, edgecolors=point_colors,
+                        linewidths=stroke * size_factor, zorder=2)
+
+    # rug plots on the top and right sides, positioned in axes coordinates at once
+    axes_x, axes_y = (ax.transScale + ax.transLimits).transform(np.column_stack([x, y])).T
+    rug_params = dict(colors=point_colors, alpha=0.05, linewidths=0.5 * size_factor, transform=ax.transAxes, zorder=2)
+    top_rug = mplt.collections.LineCollection(
+        np.stack([np.column_stack([axes_x, np.full_like(axes_x, 1 - rug_length)]),
+                  np.column_stack([axes_x, np.ones_like(axes_x)])], axis=1), **rug_params)
+    right_rug = mplt.collections.LineCollection(
+        np.stack([np.column_stack([np.full_like(axes_y, 1 - rug_length), axes_y]),
+                  np.column_stack([np.ones_like(axes_y), axes_y])], axis=1), **rug_params)
+    ax.add_collection(top_rug, autolim=False)
+    ax.add_collection(right_rug, autolim=False)
+    for layer in (points, top_rug, right_rug):
+        layer.set_rasterized(raster)
+
+    # generate additional lines
+    line_params = dict(color="black", linewidth=0.5 * size_factor, linestyle=SCATTER_DASH_PATTERN, zorder=3)
+    ax.axline((domain[0], domain[0]), (domain[1], domain[1]), **line_params)  # diagonal
+    ax.axvline(domain[1], **line_params)  # vertical rule
+    ax.axhline(domain[1], **line_params)  # horizontal rule
+
+    if show_legend:
+        scatter_plot_legend(fig, colors, loc="center right", bbox_to_anchor=(1, 0.5))
+    return fig
+
+
+def save_plot(plot, filename, dpi=PLOT_DPI):
+    """Save a plotnine plot or a matplotlib figure to filename"""
+    if isinstance(plot, p9.ggplot):
+        plot.save(filename=filename, dpi=dpi)
+    else:
+        plot.savefig(filename, dpi=dpi)
+
+
+def draw_scatter_plot(df, backend=None, raster=None, width=6, height=6, **kwargs):
+    """Draw the scene of a scatter plot once into a matplotlib figure, the width x height plot drawn as without legend
+    and the benchmark legend in a region of SCATTER_LEGEND_WIDTH inches right of the figure (saved with
+    scatter_plot_legend_bbox())
+
+    backend is "plotnine" (scatter_plot()) or "matplotlib" (scatter_plot_matplotlib()), SCATTER_PLOT_BACKEND by
+    default. With raster (SCATTER_PLOT_RASTERIZE by default) points and rugs are rasterized.
+    Returns the figure and matplotlib rc parameters to save it with.
+    """
+    backend = SCATTER_PLOT_BACKEND if backend is None else backend
+    raster = SCATTER_PLOT_RASTERIZE if raster is None else raster
+    if backend == "plotnine":
+        plot = scatter_plot(df, raster=raster, width=width, height=height, show_legend=False, **kwargs)
+        fig, rc_params = plot.draw(), plot.theme.rcParams
+    elif backend == "matplotlib":
+        fig, rc_params = scatter_plot_matplotlib(df, raster=raster, width=width, height=height, show_legend=False,
+                                                 **kwargs), {}
+    else:
+        raise ValueError(f"Unknown scatter plot backend {backend!r}.")
+    # the legend is centered in its region, which is outside the figure, so the panel keeps its size
+    colors = scatter_plot_colors(scatter_plot_benchmarks(df['benchmark']))
+    scatter_plot_legend(fig, colors, loc="center", bbox_to_anchor=(1 + SCATTER_LEGEND_WIDTH / (2 * width), 0.5))
+    return fig, rc_params
+
+
+def scatter_plot_legend_bbox(width=6, height=6):
+    """Bounding box in inches of a scene of draw_scatter_plot() with its legend region"""
+    return mplt.transforms.Bbox.from_bounds(0, 0, width + SCATTER_LEGEND_WIDTH, height)
+
+
+def save_scatter_plots(filename, df, legend_filename=None, legend_separate_filename=None, backend=None, raster=None,
+                       width=6, height=6, **kwargs):
+    """Render job drawing a scatter plot once and saving it without legend to filename, with the legend to
+    legend_filename and the legend alone to legend_separate_filename (skipped if None)
+
+    See draw_scatter_plot() for the parameters.
+    """
+    raster = SCATTER_PLOT_RASTERIZE if raster is None else raster
+    dpi = SCATTER_PLOT_RASTER_DPI if raster else PLOT_DPI
+    fig, rc_params = draw_scatter_plot(df, backend, raster, width, height, **kwargs)
+    legend = fig.legends[0]
+    with mplt.rc_context(rc_params):
+        if legend_filename is not None:
+            fig.savefig(legend_filename, dpi=dpi, bbox_inches=scatter_plot_legend_bbox(width, height))
+        if legend_separate_filename is not None:
+            figlegend = mplt.figure.Figure(figsize=(4, 4))
+            figlegend.legend(legend.legend_handles, [text.get_text() for text in legend.get_texts()],
+                             title="Benchmark", loc='center', frameon=False)
+            figlegend.savefig(legend_separate_filename, dpi=dpi, bbox_inches='tight')
+        legend.set_visible(False)
+        fig.savefig(filename, dpi=dpi)
+
+
+class Instrumentation:
+    """Opt-in records of wall time, CPU time and peak allocated memory of pipeline stages
+
+    Stages are measured with stage() and labelled by their own labels and those of enclosing labels() blocks (e.g. the
+    benchmark subset). Memory is traced with tracemalloc, the peak of a stage includes its nested stages. While not
+    started, stage() and labels() do nothing.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.records = []
+        self.current_labels = {}
+        self._peaks = []  # Peaks of enclosing stages before their nested stages reset tracemalloc's peak.
+        self._started_tracing = False  # Only tracing started by start() is stopped by stop().
+
+    def start(self):
+        self.enabled = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self):
+        self.enabled = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextlib.contextmanager
+    def labels(self, **labels):
+        """Add labels to stages measured in the block"""
+        outer_labels = self.current_labels
+        self.current_labels = {**outer_labels, **labels}
+        try:
+            yield
+        finally:
+            self.current_labels = outer_labels
+
+    @contextlib.contextmanager
+    def stage(self, name, **labels):
+        """Measure the block as stage name"""
+        if not self.enabled:
+            yield
+            return
+        memory_start, peak = tracemalloc.get_traced_memory()
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        tracemalloc.reset_peak()
+        self._peaks.append(memory_start)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall_time, cpu_time = time.perf_counter() - wall_start, time.process_time() - cpu_start
+            peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            self.records.append(dict(stage=name, labels={**self.current_labels, **labels}, wall_time=wall_time,
+                                     cpu_time=cpu_time, memory_start=memory_start, memory_peak=peak, pid=os.getpid()))
+
+    def summary(self):
+        """Table of totals of stages with the same name, the slowest first"""
+        if not self.records:
+            return "No instrumented stages."
+        df = pd.DataFrame(self.records)
+        stages = df.groupby("stage", sort=False).agg(count=("stage", "size"), wall_time=("wall_time", "sum"),
+                                                      cpu_time=("cpu_time", "sum"), memory_peak=("memory_peak", "max"))
+        stages["memory_peak"] = stages["memory_peak"] / 2**20
+        stages = stages.sort_values("wall_time", ascending=False)
+        return tab.tabulate(stages, headers=["stage", "count", "wall time [s]", "CPU time [s]", "peak memory [MiB]"],
+                            tablefmt="github", floatfmt=["", ".0f", ".2f", ".2f", ".2f"])
+
+    def save_report(self, path):
+        """Write all records as JSON to path"""
+        with open(path, "w") as report_file:
+            json.dump({"stages": self.records}, report_file, indent=1)
+
+
+instrumentation = Instrumentation()
+
+
+def run_instrumented(name, labels, job, *args, **kwargs):
+    """Run job(*args, **kwargs) as an instrumented stage in a worker process, returns the result and the records"""
+    instrumentation.records = []
+    instrumentation.start()
+    with instrumentation.labels(**labels), instrumentation.stage(name):
+        result = job(*args, **kwargs)
+    return result, instrumentation.records
+
+
+class RenderQueue:
+    """Queue of render jobs executed by a pool of worker processes
+
+    A render job is a picklable function saving a plot to a file. With jobs=1 the jobs are run right away in the
+    current process. Leaving the queue as a context manager waits for all submitted jobs and re-raises their errors.
+    Jobs are instrumented as stages named by their function.
+    """
+
+    def __init__(self, jobs=1):
+        self.executor = None
+        if jobs != 1:
+            self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+        self.futures = []
+        self.instrumented = set()  # Futures of jobs run by run_instrumented().
+
+    def submit(self, job, *args, **kwargs):
+        if self.executor is None:
+            with instrumentation.stage(job.__name__):
+                job(*args, **kwargs)
+        elif instrumentation.enabled:
+            self.futures.append(self.executor.submit(run_instrumented, job.__name__, instrumentation.current_labels,
+                                                     job, *args, **kwargs))
+            self.instrumented.add(self.futures[-1])
+        else:
+            self.futures.append(self.executor.submit(job, *args, **kwargs))
+
+    def wait(self):
+        """Wait for all submitted jobs to finish"""
+        futures, self.futures = self.futures, []
+        instrumented, self.instrumented = self.instrumented, set()
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            # Records of jobs submitted while instrumentation was on, even if it was turned off since.
+            if future in instrumented:
+                instrumentation.records.extend(result[1])
+
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def build_parameters(dfs):
+    """Parameters other than input files and selections which outputs depend on, for BuildManifest fingerprints"""
+    return dict(timeout=TIMEOUT, timeout_val=TIMEOUT_VAL, time_min=TIME_MIN, plot_dpi=PLOT_DPI,
+                scatter_plot_size=SCATTER_PLOT_SIZE, scatter_plot_backend=SCATTER_PLOT_BACKEND,
+                scatter_plot_rasterize=SCATTER_PLOT_RASTERIZE, scatter_plot_raster_dpi=SCATTER_PLOT_RASTER_DPI,
+                cactus_plot_thin_tolerance=CACTUS_PLOT_THIN_TOLERANCE,
+                cactus_plot_format=CACTUS_PLOT_FORMAT, table_formats=TABLE_FORMATS, exact_quantiles=EXACT_QUANTILES,
+                bootstrap_resamples=BOOTSTRAP_RESAMPLES,
+                bootstrap_confidence=BOOTSTRAP_CONFIDENCE, bootstrap_seed=BOOTSTRAP_SEED,
+                noodler_version=dfs.noodler_version,
+                noodler_underapprox_version=dfs.noodler_underapprox_version, mask_unknown=dfs.mask_unknown)
+
+
+class BuildManifest:
+    """Record of generated outputs and of what they were generated from, for incremental builds
+
+    Each target (an evaluation, a cactus plot) is recorded with its fingerprint, a hash of its input files, its
+    tool/benchmark selection and parameters, with the list of files it generated and with what it printed. A target
+    is up to date when its fingerprint did not change and all its files still exist.
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.targets = {}
+        with contextlib.suppress(FileNotFoundError, ValueError, KeyError):
+            self.targets = json.loads(self.path.read_text())["targets"]
+
+    @staticmethod
+    def fingerprint(input_files, **params):
+        """Hash of the content of input_files and of params"""
+        inputs = {str(file): file_hash(file) for file in input_files}
+        encoded = json.dumps({"inputs": inputs, "params": params}, sort_keys=True,
+                             default=lambda o: o.value if isinstance(o, enum.Enum) else str(o))
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def is_up_to_date(self, target, fingerprint):
+        recorded = self.targets.get(target)
+        return (recorded is not None and recorded["fingerprint"] == fingerprint
+                and all(pathlib.Path(output).exists() for output in recorded["outputs"]))
+
+    def record(self, target, fingerprint, outputs, stdout="", statistics=None):
+        if statistics is not None:
+            statistics = json.loads(statistics.reset_index().to_json(orient="records"))
+        self.targets[target] = {"fingerprint": fingerprint, "outputs": [str(output) for output in outputs],
+                                "stdout": stdout, "statistics": statistics}
+
+    def stdout(self, target):
+        return self.targets[target]["stdout"]
+
+    def statistics(self, target):
+        """Statistics recorded with a target (a data frame indexed by its first column), None if there are none"""
+        statistics = self.targets.get(target, {}).get("statistics")
+        if statistics is None:
+            return None
+        df = pd.DataFrame(statistics)
+        return df.set_index(df.columns[0])
+
+    def save(self):
+        self.path.write_text(json.dumps({"targets": self.targets}, indent=2))
+
+
 # Print a matrix of plots
 def matrix_plot(list_of_plots, cols):
     assert len(list_of_plots) > 0
@@ -162,15 +710,74 @@ def matrix_plot(list_of_plots, cols):
 
 
 # table to LaTeX file
-def table_to_file(table, headers, out_file):
-    with open(f"tables/{out_file}.tex", mode='w+') as fl:
-        print(tab.tabulate(table, headers=headers, tablefmt="latex"), file=fl)
-
-def sanity_check(df):
-    """Sanity check"""
-    pt = df[["name", "z3-result", "cvc5-result", Tool.noodler.value+"-result"]]
-    pt = pt.dropna()
-    pt = pt[(pt["cvc5-result"] != pt[Tool.noodler.value + "-result"]) | (pt["z3-result"] != pt[Tool.noodler.value + "-result"])]
+def table_to_file(table, headers, out_file, formats=None, tables_folder="tables", **kwargs):
+    """Write a table (rows or a data frame with its index) with headers to <tables_folder>/<out_file> in formats
+    (TABLE_FORMATS by default), returns the written files
+
+    LaTeX and markdown are formatted by tabulate (with kwargs), CSV keeps the values as they are.
+    """
+    file_names = []
+    for table_format in TABLE_FORMATS if formats is None else formats:
+        file_name = output_path(tables_folder, out_file + TABLE_FORMAT_SUFFIXES[table_format])
+        if table_format == "csv":
+            rows = table.reset_index() if isinstance(table, pd.DataFrame) else pd.DataFrame(list(table))
+            rows.set_axis(headers, axis=1).to_csv(file_name, index=False)
+        else:
+            with open(file_name, mode='w+') as fl:
+                tablefmt = "latex" if table_format == "latex" else "github"
+                print(tab.tabulate(table, headers=headers, tablefmt=tablefmt, **kwargs), file=fl)
+        file_names.append(file_name)
+    return file_names
+
+
+def gen_table(title, table, headers, out_file, tables_folder="tables", **kwargs):
+    """Print a table under its title (as markdown, into the statistics) and write it with table_to_file()"""
+    print(title)
+    print(tab.tabulate(table, headers=headers, tablefmt="github", **kwargs))
+    print()
+    return table_to_file(table, headers, out_file, tables_folder=tables_folder, **kwargs)
+
+
+def sanity_check(df, tools=None):
+    """Sanity check: instances where tools disagree, some of them return sat and others unsat
+
+    tools are all tools with results in df except z3-noodler-common (a copy of results of other tools) by default.
+    Returns a data frame with benchmark and name of these instances, the tools returning sat and unsat
+    (comma-separated) and results of all tools.
+    """
+    if tools is None:
+        tool_names = [col.rsplit('-', 1)[0] for col in df.columns
+                      if re.search('-result$', col) and col != f"{Tool.noodler_common.value}-result"]
+    else:
+        tool_names = [getattr(tool, "value", tool) for tool in tools]
+    result_columns = [f"{tool}-result" for tool in tool_names]
+    result_codes = np.column_stack([pd.Categorical(df[col], dtype=RESULT_DTYPE).codes for col in result_columns])
+    sat = result_codes == RESULT_DTYPE.categories.get_loc('sat')
+    unsat = result_codes == RESULT_DTYPE.categories.get_loc('unsat')
+    conflicting = np.flatnonzero(sat.any(axis=1) & unsat.any(axis=1))
+
+    def tool_lists(answers):
+        lists = np.full(len(conflicting), "", dtype=object)
+        for i, tool in enumerate(tool_names):
+            lists = lists + np.where(answers[conflicting, i], "," + tool, "")
+        return [tool_list[1:] for tool_list in lists]
+
+    pt = df.iloc[conflicting][["benchmark", "name"] + result_columns].reset_index(drop=True)
+    pt.insert(2, "sat", tool_lists(sat))
+    pt.insert(3, "unsat", tool_lists(unsat))
+    return pt
+
+
+def gen_sanity_report(df, name, file=sys.stderr):
+    """Write sanity_check() of df to csvs/sanity-<name>.csv and print the number of instances per benchmark, returns
+    the report"""
+    pt = sanity_check(df)
+    file_name = output_path("csvs", f"sanity-{name}.csv")
+    pt.to_csv(file_name, index=False)
+    counts = pt["benchmark"].value_counts(sort=False)
+    counts = ", ".join(f"{benchmark}: {count}" for benchmark, count in counts.items() if count)
+    print(f"Sanity check {name}: {len(pt)} instances with both sat and unsat results{f' ({counts})' if counts else ''}, "
+          f"see {file_name}", file=file)
     return pt
 
 
@@ -179,8 +786,9 @@ def generate_cactus_plot(df, file_name: str, start: int = 0, end: int = 27000, l
 
     for t in df.columns:
         #print(df[t])
-        tseries1 = pd.Series(df[t].tolist())
-        tseries1 = tseries1[start:]
+        # Instance positions are in the index (thinned data may skip some).
+        tseries1 = pd.Series(df[t].tolist(), index=df.index)
+        tseries1 = tseries1[tseries1.index >= start]
         concat.insert(0, t.rsplit('-', 1)[0], tseries1)
 
     plt = concat.plot.line(grid=True, fontsize=10, lw=2, figsize=(10, 3))
@@ -200,8 +808,8 @@ def generate_cactus_plot(df, file_name: str, start: int = 0, end: int = 27000, l
     # plt.axvline(x=end)
     figlegend = pylab.figure(figsize=(4,4))
     figlegend.legend(plt.get_children(), concat.columns, loc='center', frameon=False)
-    figlegend.savefig(f"graphs/fig-cactus-{file_name}-legend.pdf", dpi=1000, bbox_inches='tight')
-    plt.figure.savefig(f"graphs/fig-cactus-{file_name}.pdf", dpi=1000, bbox_inches='tight')
+    figlegend.savefig(output_path("graphs", f"fig-cactus-{file_name}-legend.pdf"), dpi=PLOT_DPI, bbox_inches='tight')
+    plt.figure.savefig(output_path("graphs", f"fig-cactus-{file_name}.pdf"), dpi=PLOT_DPI, bbox_inches='tight')
 
 
 def gen_vbs_plot(df, tools1, tools2, legend1, legend2):
@@ -242,53 +850,363 @@ def gen_vbs_plot(df, tools1, tools2, legend1, legend2):
     plt.figure.savefig("/home/fig-vbs.pdf", dpi=1000)
 
 
-def gen_evaluation(df, main_tool, all_tools, timeout_time=120, benchmark_name=None):
-    """Generate multiple types of evaluations for passed data."""
-
-    #print(f"time:  {datetime.datetime.now()}")
-    print(f"Benchmark: {benchmark_name}")
-    print(f"# of formulae: {len(df)}")
-
-    summary_times = dict()
-    for col in df.columns:
-        if re.search('-result$', col):
-            summary_times[col] = dict()
-            df[col] = df[col].str.strip()
-            summary_times[col]['unknowns'] = df[df[col] == "unknown"].shape[0] #[df[col] == "unknown"].shape[0]
-            summary_times[col]['errors'] = df[df[col] == "ERR"].shape[0] #[df[col] == "unknown"].shape[0]
-            summary_times[col]['timeouts'] = df[df[col] == "TO"].shape[0] #[df[col] == "unknown"].shape[0]
-
-    #print(summary_times)
-
-    # Remove unknowns
-    df = df.drop(df[df[main_tool.value + "-result"] == "unknown"].index)
-
-    for col in df.columns:
-        if re.search('-runtime$', col):
-            col_tool_name = col.rsplit('-', 1)[0]
-            col_result_name = f"{col_tool_name}-result"
-            timeouts_err_unknown_num = df[col].isna().sum()
-            timeouts_num: int = summary_times[col_result_name]["timeouts"]
-            time_sum = df[col].sum()
-            summary_times[col] = dict()
-            summary_times[col]['sum'] = time_sum
-            summary_times[col]['sum_with_timeouts'] = time_sum + timeout_time * timeouts_num
-            summary_times[col]['max'] = df[col].max()
-            summary_times[col]['min'] = df[col].min()
-            summary_times[col]['mean'] = df[col].mean()
-            summary_times[col]['median'] = df[col].median()
-            summary_times[col]['std'] = df[col].std()
-            summary_times[col]['timeouts'] = timeouts_num
-            summary_times[col]['errors'] = summary_times[col_result_name]["errors"]
-            summary_times[col]['unknowns'] = summary_times[col_result_name]["unknowns"]
-
-    #print(summary_times)
-
-    df_summary_times = pd.DataFrame(summary_times).transpose()
+class RunningStats:
+    """Mergeable count, sum, min, max, mean and variance of runtimes of several tools
+
+    Means and variances are combined with Welford's/Chan's parallel update, so aggregates of chunks can be merged in any
+    order without keeping the chunks. Sums are exactly rounded per chunk (math.fsum) and merged with their rounding
+    errors kept in sum_error, so merged sums match a compensated sum of all runtimes.
+    """
+
+    def __init__(self, num_tools):
+        self.count = np.zeros(num_tools, dtype=np.int64)
+        self.sum = np.zeros(num_tools)
+        self.sum_error = np.zeros(num_tools)  # Rounding errors of merged sums.
+        self.min = np.full(num_tools, np.inf)
+        self.max = np.full(num_tools, -np.inf)
+        self.mean = np.zeros(num_tools)
+        self.m2 = np.zeros(num_tools)  # Sum of squared differences from the mean.
+
+    def update(self, runtimes):
+        """Add runtimes, an array (instances x tools) with NaN for missing runtimes"""
+        valid = ~np.isnan(runtimes)
+        chunk = RunningStats(runtimes.shape[1])
+        chunk.count = valid.sum(axis=0)
+        chunk.sum = np.array([math.fsum(runtimes[valid[:, tool], tool]) for tool in range(runtimes.shape[1])])
+        chunk.min = np.where(valid, runtimes, np.inf).min(axis=0, initial=np.inf)
+        chunk.max = np.where(valid, runtimes, -np.inf).max(axis=0, initial=-np.inf)
+        chunk.mean = np.divide(chunk.sum, chunk.count, out=np.zeros_like(chunk.sum), where=chunk.count > 0)
+        chunk.m2 = np.where(valid, (runtimes - chunk.mean) ** 2, 0.0).sum(axis=0)
+        self.merge(chunk)
+
+    def merge(self, other):
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        other_weight = np.divide(other.count, count, out=np.zeros_like(self.mean), where=count > 0)
+        self.mean = self.mean + delta * other_weight
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * other_weight
+        self.count = count
+        # Knuth's two-sum, the rounding error of the sum is added to sum_error.
+        total = self.sum + other.sum
+        other_part = total - self.sum
+        self.sum_error = self.sum_error + other.sum_error + (self.sum - (total - other_part)) + (other.sum - other_part)
+        self.sum = total
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+
+    def std(self):
+        """Sample standard deviation (as pandas' std()), NaN for less than two runtimes"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+
+    def statistics(self):
+        """Sum, max, min, mean (sum / count as pandas' mean()) and std of each tool, NaN but the sum for no runtimes"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            total = self.sum + self.sum_error
+            mean = np.where(self.count > 0, total / self.count, np.nan)
+        return {"sum": total, "max": np.where(self.count > 0, self.max, np.nan),
+                "min": np.where(self.count > 0, self.min, np.nan), "mean": mean, "std": self.std()}
+
+
+class RuntimeHistogram:
+    """Mergeable histogram of runtimes of several tools, a quantile sketch of fixed size
+
+    Runtimes are rounded to multiples of resolution, so quantiles of runtimes measured with that resolution are exact
+    and other quantiles are off by at most resolution / 2. The last bin is widened up to the largest runtime of each
+    tool: runtimes above max_runtime fall into it and quantiles in it are that largest runtime, off by at most its
+    distance to max_runtime.
+    """
+
+    def __init__(self, num_tools, resolution=QUANTILE_RESOLUTION, max_runtime=TIMEOUT_VAL):
+        self.resolution = resolution
+        self.counts = np.zeros((num_tools, int(round(max_runtime / resolution)) + 1), dtype=np.int64)
+        self.max = np.full(num_tools, -np.inf)
+
+    def update(self, runtimes):
+        """Add runtimes, an array (instances x tools) with NaN for missing runtimes"""
+        num_tools, num_bins = self.counts.shape
+        valid = ~np.isnan(runtimes)
+        bins = np.clip(np.rint(np.where(valid, runtimes, 0.0) / self.resolution), 0, num_bins - 1).astype(np.int64)
+        flat_bins = (bins + np.arange(num_tools) * num_bins)[valid]
+        self.counts += np.bincount(flat_bins, minlength=num_tools * num_bins).reshape(num_tools, num_bins)
+        self.max = np.fmax(self.max, np.nanmax(runtimes, axis=0, initial=-np.inf))
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.max = np.fmax(self.max, other.max)
+
+    def quantiles(self, qs):
+        """Quantiles qs of each tool's runtimes (tools x qs), interpolated linearly between the runtimes around them
+        as numpy's quantile(), NaN for no runtimes"""
+        cumulative = np.cumsum(self.counts, axis=1)
+        total = cumulative[:, -1]
+        quantiles = np.full((len(total), len(qs)), np.nan)
+        for tool, tool_total in enumerate(total):
+            if tool_total > 0:
+                positions = (tool_total - 1) * np.asarray(qs, dtype=float)
+                lower = np.floor(positions)
+                ranks = np.stack([lower, np.minimum(lower + 1, tool_total - 1)])
+                # Bins divided by bins per second are the closest floats to multiples of resolution (not 0.57000001).
+                bins = np.searchsorted(cumulative[tool], ranks, side="right")
+                runtimes = bins / round(1 / self.resolution)
+                last_bin = bins == self.counts.shape[1] - 1
+                runtimes[last_bin] = np.maximum(runtimes[last_bin], self.max[tool])
+                quantiles[tool] = runtimes[0] + (runtimes[1] - runtimes[0]) * (positions - lower)
+        return quantiles
+
+    def median(self):
+        """Median of each tool's runtimes (the mean of the two middle ones for an even count), NaN for no runtimes"""
+        return self.quantiles([0.5])[:, 0]
+
+
+def summary_statistics(df, groups, timeout_time=TIMEOUT, exact_quantiles=None):
+    """Compute Table 1 and basic time statistics of all tools for all groups of benchmarks at once.
+
+    groups maps group names to pairs (benchmark names or None for all instances, main tool). As in gen_evaluation(),
+    timeouts, errors and unknowns are counted over all instances of a group, while runtime statistics skip instances
+    where the main tool of the group returns unknown. Result counts are taken per benchmark in a single bincount and
+    summed per group. Runtime statistics are aggregated once per benchmark and main tool into RunningStats and
+    RuntimeHistogram and merged per group, so instances are not rescanned for each group.
+
+    Runtime quantiles (SUMMARY_QUANTILES) are computed by sorting runtimes of each group with exact_quantiles
+    (EXACT_QUANTILES by default), otherwise they are read from the merged histograms (see RuntimeHistogram for the error).
+
+    Returns a data frame indexed by (group name, tool name).
+    """
+    tools = [col.rsplit('-', 1)[0] for col in df.columns if re.search('-result$', col)]
+    benchmarks = df["benchmark"].astype("category")
+    benchmark_codes = benchmarks.cat.codes.to_numpy().astype(np.int64)
+    benchmark_names = benchmarks.cat.categories
+    result_codes = np.column_stack([pd.Categorical(df[f"{tool}-result"], dtype=RESULT_DTYPE).codes for tool in tools])
+    runtimes = np.column_stack([widen_runtimes(df[f"{tool}-runtime"]).to_numpy() for tool in tools])
+
+    # counts[benchmark, tool, result]
+    num_results = len(RESULT_DTYPE.categories)
+    counts_index = (benchmark_codes[:, np.newaxis] * len(tools) + np.arange(len(tools))) * num_results + result_codes
+    counts = np.bincount(counts_index[result_codes >= 0], minlength=len(benchmark_names) * len(tools) * num_results)
+    counts = counts.reshape(len(benchmark_names), len(tools), num_results)
+
+    unknown_code = RESULT_DTYPE.categories.get_loc('unknown')
+    # main tool -> (RunningStats, RuntimeHistogram) of each benchmark over instances the main tool knows
+    aggregates = {}
+    for _, main_tool in groups.values():
+        if main_tool in aggregates:
+            continue
+        known = np.flatnonzero(result_codes[:, tools.index(main_tool.value)] != unknown_code)
+        known = known[np.argsort(benchmark_codes[known], kind="stable")]
+        boundaries = np.searchsorted(benchmark_codes[known], np.arange(1, len(benchmark_names)))
+        aggregates[main_tool] = []
+        for rows in np.split(known, boundaries):
+            stats, histogram = RunningStats(len(tools)), RuntimeHistogram(len(tools))
+            stats.update(runtimes[rows])
+            histogram.update(runtimes[rows])
+            aggregates[main_tool].append((stats, histogram))
+
+    qs = list(SUMMARY_QUANTILES.values())
+    exact_quantiles = EXACT_QUANTILES if exact_quantiles is None else exact_quantiles
+    group_counts, group_stats, group_quantiles = [], [], []
+    for benchmark_selection, main_tool in groups.values():
+        if benchmark_selection is None:
+            member_codes = np.arange(len(benchmark_names))
+        else:
+            member_codes = benchmark_names.get_indexer(benchmark_selection)
+            member_codes = member_codes[member_codes >= 0]
+        group_counts.append(counts[member_codes].sum(axis=0))
+        stats, histogram = RunningStats(len(tools)), RuntimeHistogram(len(tools))
+        for code in member_codes:
+            stats.merge(aggregates[main_tool][code][0])
+            histogram.merge(aggregates[main_tool][code][1])
+        group_stats.append(stats.statistics())
+        if exact_quantiles:
+            main_tool_known = result_codes[:, tools.index(main_tool.value)] != unknown_code
+            rows = np.isin(benchmark_codes, member_codes) & main_tool_known
+            group_quantiles.append(pd.DataFrame(runtimes[rows]).quantile(qs).to_numpy().T)
+        else:
+            group_quantiles.append(histogram.quantiles(qs))
+
+    index = pd.MultiIndex.from_product([list(groups), tools], names=["group", "tool"])
+    runtime_stats = ["sum", "max", "min", "mean", "std"]
+    summary = pd.DataFrame({stat: np.concatenate([stats[stat] for stats in group_stats] or [np.zeros(0)])
+                            for stat in runtime_stats}, index=index)
+    quantiles = np.concatenate(group_quantiles or [np.zeros((0, len(qs)))])
+    for i, name in enumerate(SUMMARY_QUANTILES):
+        summary.insert(summary.columns.get_loc("std"), name, quantiles[:, i])
+    group_counts = np.stack(group_counts).reshape(len(groups) * len(tools), num_results).astype(float)
+    for column, result in [("timeouts", "TO"), ("errors", "ERR"), ("unknowns", "unknown")]:
+        summary[column] = group_counts[:, RESULT_DTYPE.categories.get_loc(result)]
+    summary.insert(1, "sum_with_timeouts", summary["sum"] + timeout_time * summary["timeouts"])
+
+    return summary
+
+
+def win_matrices(df, groups, chunksize=10_000):
+    """Compute wins and loses of all pairs of tools for all groups of benchmarks at once.
+
+    groups are as in summary_statistics(). As in gen_evaluation(), instances where the main tool of a group returns
+    unknown are skipped and missing runtimes count as TIMEOUT_VAL. A tool wins against an opponent on an instance when it
+    is faster, a timeout win is a win where the opponent times out. Runtimes of all tools are compared by broadcasting
+    (instances x tools x tools) in chunks of rows, and the comparisons are counted per benchmark and main tool with one
+    matrix product, then summed per group.
+
+    Returns a data frame indexed by (group name, tool name, opponent name) with columns wins, wins_timeouts, loses and
+    loses_timeouts.
+    """
+    tools = [col.rsplit('-', 1)[0] for col in df.columns if re.search('-result$', col)]
+    num_tools = len(tools)
+    benchmarks = df["benchmark"].astype("category")
+    benchmark_codes = benchmarks.cat.codes.to_numpy().astype(np.int64)
+    benchmark_names = benchmarks.cat.categories
+    main_tools = list(dict.fromkeys(main_tool.value for _, main_tool in groups.values()))
+
+    # sanitized runtimes as in gen_evaluation()
+    runtimes = np.column_stack([widen_runtimes(df[f"{tool}-runtime"]).to_numpy() for tool in tools])
+    runtimes = np.maximum(np.where(np.isnan(runtimes), TIMEOUT_VAL, runtimes), TIME_MIN)
+
+    # members[instance, benchmark * main tool] is 1 when the instance is in the benchmark and the main tool knows it
+    main_tools_known = np.column_stack([df[f"{tool}-result"].to_numpy() != "unknown" for tool in main_tools])
+    members = np.zeros((len(df), len(benchmark_names), len(main_tools)))
+    members[np.arange(len(df)), benchmark_codes] = main_tools_known
+    members = members.reshape(len(df), len(benchmark_names) * len(main_tools))
+
+    # counts[benchmark * main tool, tool * opponent] of wins and timeout wins
+    wins = np.zeros((members.shape[1], num_tools * num_tools))
+    wins_timeouts = np.zeros_like(wins)
+    for start in range(0, len(df), chunksize):
+        chunk = runtimes[start:start + chunksize]
+        chunk_wins = chunk[:, :, np.newaxis] < chunk[:, np.newaxis, :]
+        chunk_wins_timeouts = chunk_wins & (chunk[:, np.newaxis, :] == TIMEOUT_VAL)
+        chunk_members = members[start:start + chunksize].T
+        wins += chunk_members @ chunk_wins.reshape(len(chunk), -1)
+        wins_timeouts += chunk_members @ chunk_wins_timeouts.reshape(len(chunk), -1)
+    wins = wins.reshape(len(benchmark_names), len(main_tools), num_tools, num_tools)
+    wins_timeouts = wins_timeouts.reshape(wins.shape)
+
+    group_wins = []
+    group_wins_timeouts = []
+    for benchmark_selection, main_tool in groups.values():
+        if benchmark_selection is None:
+            member_codes = np.arange(len(benchmark_names))
+        else:
+            member_codes = benchmark_names.get_indexer(benchmark_selection)
+            member_codes = member_codes[member_codes >= 0]
+        group_wins.append(wins[member_codes, main_tools.index(main_tool.value)].sum(axis=0))
+        group_wins_timeouts.append(wins_timeouts[member_codes, main_tools.index(main_tool.value)].sum(axis=0))
+    group_wins = np.stack(group_wins).astype(np.int64)
+    group_wins_timeouts = np.stack(group_wins_timeouts).astype(np.int64)
+
+    index = pd.MultiIndex.from_product([list(groups), tools, tools], names=["group", "tool", "opponent"])
+    return pd.DataFrame({
+        "wins": group_wins.reshape(-1),
+        "wins_timeouts": group_wins_timeouts.reshape(-1),
+        "loses": group_wins.transpose(0, 2, 1).reshape(-1),
+        "loses_timeouts": group_wins_timeouts.transpose(0, 2, 1).reshape(-1),
+    }, index=index)
+
+
+def bootstrap_statistics(df, main_tool, tools, resamples, confidence=BOOTSTRAP_CONFIDENCE, seed=BOOTSTRAP_SEED,
+                         batch_size=BOOTSTRAP_BATCH_SIZE):
+    """Bootstrap percentile confidence intervals of median and mean runtime, solved count and geometric-mean speedup
+    of main_tool against each of tools.
+
+    Runtime statistics skip instances where main_tool returns unknown as in summary_statistics(), a tool solves an
+    instance when it returns sat or unsat. The speedup against a tool is the geometric mean of its runtime divided by
+    the runtime of main_tool over instances where main_tool does not return unknown, with missing runtimes counted as
+    TIMEOUT_VAL as in win_matrices(). Instances are resampled in batches of index matrices (resamples x instances,
+    batch_size instances at most), every batch is turned into a matrix of how many times each instance was drawn, and
+    the statistics of all resamples of the batch are weighted sums (matrix products) and weighted medians (cumulative
+    sums over instances sorted by runtime) of these counts.
+
+    Returns a data frame indexed by tool names with the columns median, mean, solved and speedup holding the
+    statistics of the data and with their confidence bounds in columns suffixed with _low and _high.
+    """
+    tool_names = [tool.value for tool in tools]
+    num_instances = len(df)
+    solved_codes = RESULT_DTYPE.categories.get_indexer(['sat', 'unsat'])
+    solved = np.column_stack([np.isin(pd.Categorical(df[f"{tool}-result"], dtype=RESULT_DTYPE).codes, solved_codes)
+                              for tool in tool_names])
+    runtimes = np.column_stack([widen_runtimes(df[f"{tool}-runtime"]).to_numpy() for tool in tool_names])
+    main_tool_known = (df[f"{main_tool.value}-result"] != "unknown").to_numpy()
+    timed = main_tool_known[:, np.newaxis] & ~np.isnan(runtimes)
+    sanitized = np.maximum(np.where(np.isnan(runtimes), TIMEOUT_VAL, runtimes), TIME_MIN)
+    main_runtimes = np.maximum(np.nan_to_num(widen_runtimes(df[f"{main_tool.value}-runtime"]).to_numpy(),
+                                             nan=TIMEOUT_VAL), TIME_MIN)
+    log_speedups = np.where(main_tool_known[:, np.newaxis], np.log(sanitized) - np.log(main_runtimes)[:, np.newaxis],
+                            0.0)
+    # instances with runtimes of each tool sorted by their runtime, for weighted medians
+    orders = [np.flatnonzero(timed[:, i])[np.argsort(runtimes[timed[:, i], i], kind="stable")]
+              for i in range(len(tool_names))]
+    # Medians of resamples are searched for in windows of sorted instances around the middle (medians outside of them
+    # are about 6 standard deviations away and searched for in all instances), before[instance, tool] marks instances
+    # sorted before the window.
+    windows = []
+    before = np.zeros((num_instances, len(tool_names)), dtype=bool)
+    for i, order in enumerate(orders):
+        half_width = int(3 * np.sqrt(len(order))) + 1
+        windows.append((max(0, len(order) // 2 - half_width), min(len(order), len(order) // 2 + half_width + 1)))
+        before[order[:windows[-1][0]], i] = True
+    # columns summed with the counts of draws of instances by a single matrix product
+    summed = np.column_stack([np.where(timed, runtimes, 0.0), timed, solved, log_speedups, before, main_tool_known])
+
+    def weighted_statistics(counts):
+        """Statistics of resamples given by counts[resample, instance] of draws of each instance"""
+        sums = np.split(counts.astype(np.float64) @ summed, np.arange(1, 6) * len(tool_names), axis=1)
+        timed_sums, totals, solved_sums, log_speedup_sums, counts_before, main_tool_totals = sums
+        totals = np.rint(totals).astype(np.int64)
+        counts_before = np.rint(counts_before).astype(np.int64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            statistics = {
+                "mean": timed_sums / totals,
+                "solved": solved_sums,
+                "speedup": np.exp(log_speedup_sums / main_tool_totals),
+            }
+        medians = np.full((len(counts), len(tool_names)), np.nan)
+        for i, (order, (start, end)) in enumerate(zip(orders, windows)):
+            if len(order) == 0:
+                continue
+            # (0-based) ranks of the two middle runtimes, equal for odd totals
+            ranks = np.stack([(totals[:, i] - 1) // 2, totals[:, i] // 2], axis=1)
+            cumulative = counts_before[:, i, np.newaxis] + np.cumsum(counts[:, order[start:end]], axis=1)
+            positions = start + (cumulative[:, np.newaxis, :] <= ranks[:, :, np.newaxis]).sum(axis=2)
+            outside = np.flatnonzero(((positions == end) | (counts_before[:, i, np.newaxis] > ranks)).any(axis=1))
+            if len(outside):
+                cumulative = np.cumsum(counts[np.ix_(outside, order)], axis=1)
+                positions[outside] = (cumulative[:, np.newaxis, :] <= ranks[outside, :, np.newaxis]).sum(axis=2)
+            positions = np.minimum(positions, len(order) - 1)
+            medians[:, i] = np.where(totals[:, i] > 0, runtimes[order[positions], i].mean(axis=1), np.nan)
+        statistics["median"] = medians
+        return statistics
+
+    estimates = weighted_statistics(np.ones((1, num_instances), dtype=np.int32))
+    rng = np.random.default_rng(seed)
+    batch_resamples = max(1, batch_size // max(num_instances, 1))
+    batches = []
+    for start in range(0, resamples, batch_resamples):
+        num_resamples = min(batch_resamples, resamples - start)
+        draws = rng.integers(0, num_instances, size=(num_resamples, num_instances))
+        draws += np.arange(num_resamples)[:, np.newaxis] * num_instances
+        counts = np.bincount(draws.ravel(), minlength=num_resamples * num_instances)
+        batches.append(weighted_statistics(counts.reshape(num_resamples, num_instances).astype(np.int32)))
+
+    result = pd.DataFrame(index=pd.Index(tool_names, name="tool"))
+    bounds = [(1 - confidence) / 2, (1 + confidence) / 2]
+    for statistic in ["median", "mean", "solved", "speedup"]:
+        result[statistic] = estimates[statistic][0]
+        if batches and num_instances > 0:
+            samples = np.concatenate([batch[statistic] for batch in batches])
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)  # All-NaN columns of tools without runtimes.
+                result[f"{statistic}_low"], result[f"{statistic}_high"] = np.nanquantile(samples, bounds, axis=0)
+        else:
+            result[f"{statistic}_low"] = result[f"{statistic}_high"] = np.nan
+    return result
+
 
+def gen_summary_tables(df_summary_times, all_tools, benchmark_name, tables_folder="tables"):
+    """Print and write Table 1, the basic time table and the runtime percentiles table from summary statistics indexed
+    by tool names (to tables_folder)"""
     tab_interesting = []
     for i in all_tools:
-        row = df_summary_times.loc[i.value + '-runtime']
+        row = df_summary_times.loc[i.value]
         row_dict = dict(row)
         row_dict.update({'name': i.value})
         tab_interesting.append([row_dict['name'],
@@ -305,14 +1223,12 @@ def gen_evaluation(df, main_tool, all_tools, timeout_time=120, benchmark_name=No
                                ])
 
     headers = ["method", "sum", "sum with timeouts", "max", "mean", "median", "std. dev", "timeouts", "errors", "unknowns"]
-    print("Table 1: " + benchmark_name)
-    print(tab.tabulate(tab_interesting, headers=headers, tablefmt="github"))
-    print()
-    table_to_file(tab_interesting, headers=headers, out_file=f"table1-{benchmark_name}")
+    outputs = gen_table("Table 1: " + benchmark_name, tab_interesting, headers, f"table1-{benchmark_name}",
+                        tables_folder)
 
     tab_basic_time = []
     for i in all_tools:
-        row = df_summary_times.loc[i.value + '-runtime']
+        row = df_summary_times.loc[i.value]
         row_dict = dict(row)
         row_dict.update({'name': i.value})
         tab_basic_time.append([
@@ -327,48 +1243,140 @@ def gen_evaluation(df, main_tool, all_tools, timeout_time=120, benchmark_name=No
 
 
     headers_basic_time = ["Method", "T/Os", "Errors", "Unknowns", "Time", "Time-T/Os"]
-    print("Table basic time: " + benchmark_name)
-    print(tab.tabulate(tab_basic_time, headers=headers_basic_time, tablefmt="github"))
-    print()
-    table_to_file(tab_basic_time, headers=headers_basic_time, out_file=f"table-basic-time-{benchmark_name}")
-
-    # sanitizing NAs
-    for col in df.columns:
-        if re.search('-runtime$', col):
-            df[col].fillna(TIMEOUT_VAL, inplace=True)
-            df.loc[df[col] < TIME_MIN, col] = TIME_MIN  # to remove 0 (in case of log graph)
-
-
-    # comparing wins/loses
-    compare_methods = []
-    for t in all_tools:
-      if t == main_tool:
-        continue
-      compare_methods.append((main_tool.value + "-runtime", t.value + "-runtime"))
-      
-    
-    # compare_methods = [("noodler-runtime", "z3-runtime"),
-    #                    ("noodler-runtime", "cvc4-runtime")
-    #                   ]
-
-    tab_wins = []
-    for left, right in compare_methods:
-        left_over_right = df[df[left] < df[right]]
-        right_timeouts = left_over_right[left_over_right[right] == TIMEOUT_VAL]
-
-        right_over_left = df[df[left] > df[right]]
-        left_timeouts = right_over_left[right_over_left[left] == TIMEOUT_VAL]
-
-        tab_wins.append([right.rsplit('-', 1)[0], len(left_over_right), len(right_timeouts), len(right_over_left), len(left_timeouts)])
-
-    #benchmark_clean_names = { full_name : full_name.split("/")[-2] for full_name in FILES }
-    #df.benchmark = df.benchmark.map(benchmark_clean_names)
-
+    outputs += gen_table("Table basic time: " + benchmark_name, tab_basic_time, headers_basic_time,
+                         f"table-basic-time-{benchmark_name}", tables_folder)
+
+    tab_percentiles = [[i.value] + [df_summary_times.loc[i.value, name] for name in SUMMARY_QUANTILES] + [
+                       df_summary_times.loc[i.value, 'max']] for i in all_tools]
+    headers_percentiles = ["method"] + list(SUMMARY_QUANTILES) + ["max"]
+    outputs += gen_table("Table percentiles: " + benchmark_name, tab_percentiles, headers_percentiles,
+                         f"table-percentiles-{benchmark_name}", tables_folder)
+
+    return outputs
+
+
+def evaluation_statistics(summary, wins, main_tool, all_tools, bootstrap=None):
+    """Statistics of the tables of an evaluation indexed by tool names: summary statistics (Table 1 and basic time),
+    wins and loses of main_tool against the tool (Table 2, NaN for main_tool) and bootstrap statistics prefixed by
+    bootstrap_ (if any)"""
+    tools = [tool.value for tool in all_tools]
+    statistics = summary.loc[tools].copy()
+    main_tool_wins = wins.loc[main_tool.value].reindex(tools).astype(float)
+    main_tool_wins.loc[main_tool.value] = np.nan
+    statistics = statistics.join(main_tool_wins)
+    if bootstrap is not None:
+        statistics = statistics.join(bootstrap.loc[tools].add_prefix("bootstrap_"))
+    statistics.index.name = "tool"
+    return statistics
+
+
+def gen_statistics_files(statistics, name):
+    """Write statistics of evaluations (a dict of evaluation names to evaluation_statistics()) with columns subset
+    and tool to <name>.json and <name>.parquet, returns the written files"""
+    if not statistics:
+        return []
+    df = pd.concat(statistics, names=["subset"]).reset_index()
+    json_file, parquet_file = output_path(f"{name}.json"), output_path(f"{name}.parquet")
+    df.to_json(json_file, orient="records", indent=1)
+    df.to_parquet(parquet_file, index=False)
+    return [json_file, parquet_file]
+
+
+def gen_bootstrap_table(bootstrap, all_tools, main_tool, benchmark_name, confidence=BOOTSTRAP_CONFIDENCE):
+    """Print and write the table of bootstrap_statistics() indexed by tool names"""
+    def interval(row, statistic, fmt):
+        return f"[{row[statistic + '_low']:{fmt}}, {row[statistic + '_high']:{fmt}}]"
+
+    tab_bootstrap = []
+    for tool in all_tools:
+        row = bootstrap.loc[tool.value]
+        speedup = ["", ""] if tool == main_tool else [f"{row['speedup']:.3f}", interval(row, "speedup", ".3f")]
+        tab_bootstrap.append([tool.value,
+                              f"{row['median']:.2f}", interval(row, "median", ".2f"),
+                              f"{row['mean']:.2f}", interval(row, "mean", ".2f"),
+                              f"{row['solved']:.0f}", interval(row, "solved", ".0f"),
+                              *speedup])
+
+    ci = f"{confidence:.0%} CI"
+    headers = ["method", "median", ci, "mean", ci, "solved", ci, f"speedup of {main_tool.value}", ci]
+    return gen_table("Table bootstrap: " + benchmark_name, tab_bootstrap, headers,
+                     f"table-bootstrap-{benchmark_name}", disable_numparse=True)
+
+
+def gen_wins_table(tab_wins, benchmark_name, tables_folder="tables"):
+    """Print and write Table 2 from rows [tool, wins, wins-timeouts, loses, loses-timeouts] (to tables_folder)"""
     headers_wins = ["method", "wins", "wins-timeouts", "loses", "loses-timeouts"]
-    print("Table 2: " + benchmark_name)
-    print(tab.tabulate(tab_wins, headers=headers_wins, tablefmt="github"))
-    table_to_file(tab_wins, headers_wins, f"table2-{benchmark_name}")
-    print()
+    return gen_table("Table 2: " + benchmark_name, tab_wins, headers_wins, f"table2-{benchmark_name}", tables_folder)
+
+
+def gen_win_matrix_table(wins, all_tools, benchmark_name):
+    """Write the table of wins (timeout wins) of each tool (row) against each opponent (column) from rows of
+    win_matrices() indexed by (tool name, opponent name)"""
+    headers = ["method"] + [tool.value for tool in all_tools]
+    tab_matrix = [[tool.value] + ["" if tool == opponent else "{} ({})".format(*wins.loc[(tool.value, opponent.value),
+                                                                                        ["wins", "wins_timeouts"]])
+                                  for opponent in all_tools]
+                  for tool in all_tools]
+    return table_to_file(tab_matrix, headers, f"table2-matrix-{benchmark_name}")
+
+
+def gen_evaluation(df, main_tool, all_tools, timeout_time=120, benchmark_name=None, render_queue=None,
+                   summary=None, wins=None, tables=True, scatter=True, bootstrap=None, statistics=None):
+    """Generate multiple types of evaluations for passed data.
+
+    Scatter plots are submitted to render_queue, they are rendered right away when no queue is passed. summary are
+    rows of summary_statistics() for this data indexed by tool names, wins are rows of win_matrices() indexed by
+    (tool name, opponent name), they are computed when not passed. tables and scatter select the generated outputs.
+    With bootstrap resamples (BOOTSTRAP_RESAMPLES by default, 0 to disable), a table of bootstrap confidence
+    intervals (see bootstrap_statistics()) is generated with the tables. With tables, evaluation_statistics() of the
+    evaluation are added to the statistics dict (if passed) under benchmark_name.
+
+    Returns the list of generated table and graph files.
+    """
+
+    outputs = []
+    if tables:
+        #print(f"time:  {datetime.datetime.now()}")
+        print(f"Benchmark: {benchmark_name}")
+        print(f"# of formulae: {len(df)}")
+
+        if summary is None:
+            summary = summary_statistics(df, {benchmark_name: (None, main_tool)}, timeout_time).loc[benchmark_name]
+        df_summary_times = summary
+        if wins is None:
+            wins = win_matrices(df, {benchmark_name: (None, main_tool)}).loc[benchmark_name]
+
+        outputs += gen_summary_tables(df_summary_times, all_tools, benchmark_name)
+
+        # comparing wins/loses
+        tab_wins = []
+        for t in all_tools:
+            if t == main_tool:
+                continue
+            tab_wins.append([t.value, *wins.loc[(main_tool.value, t.value)].tolist()])
+
+        #benchmark_clean_names = { full_name : full_name.split("/")[-2] for full_name in FILES }
+        #df.benchmark = df.benchmark.map(benchmark_clean_names)
+
+        outputs += gen_wins_table(tab_wins, benchmark_name)
+        outputs += gen_win_matrix_table(wins, all_tools, benchmark_name)
+
+        if bootstrap is None:
+            bootstrap = BOOTSTRAP_RESAMPLES
+        if bootstrap:
+            with instrumentation.stage("bootstrap_statistics", resamples=bootstrap):
+                df_bootstrap = bootstrap_statistics(df, main_tool, all_tools, bootstrap)
+            outputs += gen_bootstrap_table(df_bootstrap, all_tools, main_tool, benchmark_name)
+        if statistics is not None:
+            statistics[benchmark_name] = evaluation_statistics(summary, wins, main_tool, all_tools,
+                                                               df_bootstrap if bootstrap else None)
+
+    if not scatter:
+        return outputs
+
+    # Runtimes of the plots, without unknowns of the main tool, NAs and 0 (in case of log graph), prepared once for all
+    # plots.
+    df_plot = scatter_plot_table(df, main_tool, all_tools)
 
     #print("##############    other claimed results    ###############")
 
@@ -406,73 +1414,41 @@ def gen_evaluation(df, main_tool, all_tools, timeout_time=120, benchmark_name=No
         if 'tickCount' not in params:
             params['tickCount'] = 5
         if 'filename' not in params:
-            params['filename'] = "graphs/fig_"
+            params['filename'] = "fig_"
             if benchmark_name:
                 params['filename'] += benchmark_name + "_"
 
             params['filename'] += params['x'] + "_vs_" + params['y'] + ".pdf"
+            params['filename'] = output_path("graphs", params['filename'])
 
-    size = 8
+    size = SCATTER_PLOT_SIZE
     plot_list = [
         ( params['x'],
           params['y'],
           params['filename'],
-          scatter_plot(
-              df,
+          dict(
+              legend_filename=params['filename'].rsplit('.', 1)[0] + "_legend.pdf",
+              legend_separate_filename=params['filename'].rsplit('.', 1)[0] + "_legend_separate.pdf",
               xcol=params['x'] + '-runtime',
               ycol=params['y'] + '-runtime',
               xname=params['xname'], yname=params['yname'],
               domain=[TIME_MIN, params['max']],
+              clamp=params['max'] < TIMEOUT_VAL,  # df_plot is clamped at TIMEOUT_VAL already
               tickCount=params['tickCount'],
               log=True, width=size, height=size
           )
         )
         for params in to_cmp2]
-    plot_list += [
-    ( params['x'],
-      params['y'],
-      params['filename'].split('.')[0] + "_legend.pdf",
-      scatter_plot(
-          df,
-          xcol=params['x'] + '-runtime',
-          ycol=params['y'] + '-runtime',
-          xname=params['xname'], yname=params['yname'],
-          domain=[TIME_MIN, params['max']],
-          tickCount=params['tickCount'],
-          show_legend=True,
-          log=True, width=size, height=size
-      )
-    )
-    for params in to_cmp2]
-
-    # Generate separate legends. Currently broken.
-    #for params in to_cmp2:
-    #    # fig = sns.scatterplot(data=df, x=params['x'] + '-runtime', y=params['y'] + '-runtime', hue="benchmark", style=)
-    #    fig = mplt.pyplot.scatter(x=df[params['x'] + '-runtime'], y=df[params['y'] + '-runtime'])
-
-    #    figlegend = pylab.figure(figsize=(10,10))
-    #    labels = df["benchmark"].unique().tolist()
-    #    labels.sort()
-
-    #    figlegend.legend(fig.get_children(),
-    #                     labels,
-    #                     # scatterpoints=1,
-    #                     loc='center',
-    #                     ncol=3,
-    #                     fontsize=8)
-    #    figlegend.legend(fig.get_children(), labels, loc='center', frameon=False)
-    #    figlegend.savefig(f"{params['filename'].split('.')[0] + '_legend_separate.pdf'}", dpi=1000)
 
     #print("\n\n")
     #print("Generating plots...")
-    for x, y, filename, plot in plot_list:
-        if plot:
-            #filename = f"plots/{out_prefix}_{filename}.pdf"
-            #print(f"plotting x: {x}, y: {y}... saving to {filename}")
-            # plot.save(filename, scale_factor=2)
-            plot.save(filename=filename, dpi=1000)
-
-            #print(plot)
+    if render_queue is None:
+        render_queue = RenderQueue(jobs=1)
+    for x, y, filename, plot_params in plot_list:
+        #filename = f"plots/{out_prefix}_{filename}.pdf"
+        #print(f"plotting x: {x}, y: {y}... saving to {filename}")
+        render_queue.submit(save_scatter_plots, filename, df_plot, **plot_params)
+        outputs += [filename, plot_params['legend_filename'], plot_params['legend_separate_filename']]
 
 
 
@@ -514,48 +1490,401 @@ def gen_evaluation(df, main_tool, all_tools, timeout_time=120, benchmark_name=No
     #print(tab.tabulate(unsolvable, headers='keys'))
     #print("\n\n\n\n\n")
 
+    return outputs
 
-def create_dfs(files, noodler_version, noodler_underapprox_version):
-    dfs = dict()
-    dfs_normal = dict()
-    dfs_underapprox = {}
-    for file in files:
-        benchmark_name = file.parent.name
-        df = read_file(file)
-        df["benchmark"] = benchmark_name
-        if benchmark_name in ["leetcode"]:
-            df["z3-noodler-common-runtime"] = df[noodler_version.value + "-runtime"]
-            df["z3-noodler-common-result"] = df[noodler_version.value + "-result"]
-            #dfs_underapprox[benchmark_name] = df
-            dfs_normal[benchmark_name] = df
-        if benchmark_name in ["kaluza"]:
-            df["z3-noodler-common-runtime"] = df[noodler_underapprox_version.value + "-runtime"]
-            df["z3-noodler-common-result"] = df[noodler_underapprox_version.value + "-result"]
-            dfs_underapprox[benchmark_name] = df
-        else:
-            df["z3-noodler-common-runtime"] = df[noodler_version.value + "-runtime"]
-            df["z3-noodler-common-result"] = df[noodler_version.value + "-result"]
-            dfs_normal[benchmark_name] = df
-        dfs[benchmark_name] = df
-    df_normal = pd.concat(dfs_normal)
-    sanity_check(df_normal)
-    dfs_normal["kaluza"] = dfs["kaluza"]
-    df_all = pd.concat(dfs_normal)
-    df_underapprox = pd.concat(dfs_underapprox)
 
-    return dfs, df_all, df_normal, df_underapprox
+def concat_dfs(dfs):
+    """Concatenates a dict of data frames keeping instance names dictionary-encoded"""
+    with instrumentation.stage("concat", benchmarks=list(dfs)):
+        df = pd.concat(dfs)
+        df["name"] = pd.api.types.union_categoricals([df_loc["name"] for df_loc in dfs.values()])
+    return df
+
+
+def report_memory_usage(frames, file=sys.stderr):
+    """Prints memory held by data frames and how much the compact dtypes save against object/float64 columns"""
+    usage = 0
+    legacy_usage = 0
+    for df in frames:
+        usage += df.memory_usage(deep=True).sum()
+        legacy_dtypes = {col: object if isinstance(dtype, pd.CategoricalDtype) else np.float64
+                         for col, dtype in df.dtypes.items()
+                         if isinstance(dtype, pd.CategoricalDtype) or dtype == RUNTIME_DTYPE}
+        legacy_usage += df.astype(legacy_dtypes).memory_usage(deep=True).sum()
+    mib = 1024 * 1024
+    print(f"Memory usage: {usage / mib:.1f} MiB ({legacy_usage / mib:.1f} MiB with object/float64 columns, "
+          f"{(legacy_usage - usage) / mib:.1f} MiB saved)", file=file)
+
+
+def load_benchmark(file, noodler_version, noodler_underapprox_version, benchmark_dtype=None, mask_unknown=False):
+    """Reads results of one benchmark and adds the benchmark name and z3-noodler-common columns"""
+    with instrumentation.stage("read_file", benchmark=file.parent.name):
+        df = read_file(file, mask_unknown=mask_unknown)
+    return add_benchmark_columns(df, file.parent.name, noodler_version, noodler_underapprox_version, benchmark_dtype)
+
+
+def add_benchmark_columns(df, benchmark_name, noodler_version, noodler_underapprox_version, benchmark_dtype=None):
+    """Adds the benchmark name and z3-noodler-common columns to results of a benchmark (in place)"""
+    if benchmark_dtype is None:
+        benchmark_dtype = pd.CategoricalDtype([benchmark_name])
+    df["benchmark"] = pd.Categorical([benchmark_name] * len(df), dtype=benchmark_dtype)
+    if benchmark_name in UNDERAPPROX_BENCHMARKS:
+        common_version = noodler_underapprox_version
+    else:
+        common_version = noodler_version
+    df["z3-noodler-common-runtime"] = df[common_version.value + "-runtime"]
+    df["z3-noodler-common-result"] = df[common_version.value + "-result"]
+    return df
+
+
+def load_benchmarks(files, noodler_version, noodler_underapprox_version, benchmark_dtype=None, jobs=1,
+                    mask_unknown=False):
+    """Loads benchmarks with load_benchmark(), returns their data frames in the order of files
+
+    With jobs other than 1, the files are read and normalized concurrently by a pool of jobs worker processes
+    (None for the number of CPUs).
+    """
+    load = functools.partial(load_benchmark, noodler_version=noodler_version,
+                             noodler_underapprox_version=noodler_underapprox_version, benchmark_dtype=benchmark_dtype,
+                             mask_unknown=mask_unknown)
+    if jobs == 1 or len(files) <= 1:
+        return list(map(load, files))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        if not instrumentation.enabled:
+            return list(executor.map(load, files))
+        labels = [{"benchmark": file.parent.name} for file in files]
+        results = list(executor.map(run_instrumented, itertools.repeat("load_benchmark"), labels,
+                                    itertools.repeat(load), files))
+    for _, records in results:
+        instrumentation.records.extend(records)
+    return [df for df, _ in results]
+
+
+def create_dfs(files, noodler_version, noodler_underapprox_version, jobs=1):
+    """Loads all benchmarks, returns their data frames and the combined views df_all, df_normal and df_underapprox"""
+    dataset = Dataset(files, noodler_version, noodler_underapprox_version)
+    dataset.load(jobs=jobs)
+    return dict(dataset), dataset.df_all, dataset.df_normal, dataset.df_underapprox
+
+
+def results_store_path(files, mask_unknown=False):
+    """Path of the results store of files (<benchmark>/<data file> of each benchmark), next to the benchmark folders"""
+    file = pathlib.Path(files[0])
+    return file.parent.parent / f"{file.name}{'.masked' if mask_unknown else ''}{RESULTS_STORE_SUFFIX}"
+
+
+def results_store_key(files, noodler_version, noodler_underapprox_version, mask_unknown=False):
+    """Store key of results of files: cache keys of the files and parameters of loading them"""
+    return json.dumps({"files": {str(file): read_file_cache_key(file) for file in files},
+                       "noodler_version": noodler_version.value,
+                       "noodler_underapprox_version": noodler_underapprox_version.value,
+                       "mask_unknown": mask_unknown})
+
+
+def write_results_store(path, dfs, key):
+    """Writes data frames of benchmarks (a dict) into one uncompressed Arrow IPC file, sorted by benchmark in the
+    order of dfs, returns the row ranges of benchmarks (offsets)"""
+    sizes = np.cumsum([0] + [len(df) for df in dfs.values()]).tolist()
+    offsets = dict(zip(dfs, itertools.pairwise(sizes)))
+    df = concat_dfs(dfs).reset_index(drop=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Keep NaN runtimes as values rather than nulls, so runtimes are mapped into data frames without copies.
+    for i, col in enumerate(df.columns):
+        if df[col].dtype == RUNTIME_DTYPE:
+            table = table.set_column(i, col, pa.array(df[col].to_numpy(), from_pandas=False))
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), RESULTS_STORE_KEY_FIELD: key,
+                                           RESULTS_STORE_OFFSETS_FIELD: json.dumps(offsets)})
+    # Write to a temporary file first so that concurrent readers never see a partially written store.
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+    finally:
+        with contextlib.suppress(OSError):
+            tmp_path.unlink()
+    return offsets
+
+
+def open_results_store(path, key):
+    """Data frame of a results store written by write_results_store() and the row ranges of its benchmarks, None when
+    the store is missing or has another key
+
+    The file is memory-mapped: runtimes and result codes of the data frame are read-only views of the mapped pages,
+    which are shared by all processes opening the store.
+    """
+    with contextlib.suppress(OSError, pa.ArrowException):
+        reader = pa.ipc.open_file(pa.memory_map(str(path)))
+        metadata = reader.schema.metadata or {}
+        if metadata.get(RESULTS_STORE_KEY_FIELD, b"").decode() == key:
+            offsets = {name: tuple(rows) for name, rows in json.loads(metadata[RESULTS_STORE_OFFSETS_FIELD]).items()}
+            return reader.read_all().to_pandas(split_blocks=True), offsets
+    return None
+
+
+def select_benchmarks(df, offsets, benchmark_names):
+    """Rows of benchmark_names (in their order) of df sorted by benchmark, offsets are the row ranges of benchmarks
+
+    Rows of benchmarks following each other in df are a slice sharing memory with df, others are taken by positions.
+    """
+    ranges = [offsets[name] for name in benchmark_names]
+    if all(stop == start for (_, stop), (start, _) in zip(ranges, ranges[1:])):
+        return df.iloc[ranges[0][0]:ranges[-1][1]] if ranges else df.iloc[:0]
+    return df.take(np.concatenate([np.arange(start, stop) for start, stop in ranges]))
+
+
+class Dataset(collections.abc.Mapping):
+    """Lazily loaded benchmark results
+
+    Maps benchmark names to their data frames like `dfs` from create_dfs(), but a benchmark file is read only when
+    its data frame is first accessed. Combined views (df_all, df_normal, df_underapprox) are built on first access.
+    With mask_unknown, runtimes of unknown results are masked as runtimes of errors and timeouts.
+
+    With store (RESULTS_STORE by default), results of all benchmarks are kept in one memory-mapped results store
+    (see write_results_store()), rewritten from the files only when they change. Data frames of benchmarks and the
+    combined views are then slices of the store instead of concatenated copies.
+    """
+
+    def __init__(self, files, noodler_version, noodler_underapprox_version, mask_unknown=False, store=None):
+        self.files = {file.parent.name: file for file in files}
+        self.noodler_version = noodler_version
+        self.noodler_underapprox_version = noodler_underapprox_version
+        self.mask_unknown = mask_unknown
+        self.store = RESULTS_STORE if store is None else store
+        self.benchmark_dtype = pd.CategoricalDtype(list(self.files))
+        self._dfs = {}
+        self._store = None
+
+    def __getitem__(self, benchmark_name):
+        if benchmark_name not in self._dfs:
+            if self.store:
+                self._dfs[benchmark_name] = select_benchmarks(*self.results_store(), [benchmark_name])
+            else:
+                self._dfs[benchmark_name] = load_benchmark(self.files[benchmark_name], self.noodler_version,
+                                                           self.noodler_underapprox_version, self.benchmark_dtype,
+                                                           self.mask_unknown)
+        return self._dfs[benchmark_name]
+
+    def __contains__(self, benchmark_name):
+        # Mapping's __contains__ would read the file through __getitem__.
+        return benchmark_name in self.files
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def __len__(self):
+        return len(self.files)
+
+    def load(self, benchmark_names=None, jobs=1):
+        """Load the given (all by default) benchmarks not loaded yet, using jobs worker processes"""
+        if self.store:
+            self.results_store(jobs)
+            return
+        if benchmark_names is None:
+            benchmark_names = list(self.files)
+        missing = [name for name in benchmark_names if name not in self._dfs]
+        loaded_dfs = load_benchmarks([self.files[name] for name in missing], self.noodler_version,
+                                     self.noodler_underapprox_version, self.benchmark_dtype, jobs, self.mask_unknown)
+        self._dfs.update(zip(missing, loaded_dfs))
+
+    def results_store(self, jobs=1):
+        """Data frame of the results store of all benchmarks and row ranges of benchmarks in it, the store is
+        (re)written from the files (read by jobs worker processes) when it is missing or out of date"""
+        if self._store is None:
+            files = list(self.files.values())
+            path = results_store_path(files, self.mask_unknown)
+            key = results_store_key(files, self.noodler_version, self.noodler_underapprox_version, self.mask_unknown)
+            with instrumentation.stage("results_store"):
+                self._store = open_results_store(path, key)
+                if self._store is None:
+                    dfs = dict(zip(self.files, load_benchmarks(files, self.noodler_version,
+                                                               self.noodler_underapprox_version, self.benchmark_dtype,
+                                                               jobs, self.mask_unknown)))
+                    try:
+                        write_results_store(path, dfs, key)
+                        self._store = open_results_store(path, key)
+                    except (OSError, pa.ArrowException) as e:
+                        print(f"Cannot write results store {path}: {e}", file=sys.stderr)
+                    if self._store is None:
+                        sizes = np.cumsum([0] + [len(df) for df in dfs.values()]).tolist()
+                        self._store = concat_dfs(dfs).reset_index(drop=True), dict(zip(dfs, itertools.pairwise(sizes)))
+        return self._store
+
+    def _concat(self, benchmark_names):
+        """Data frames of benchmark_names (in their order) one after another"""
+        if self.store:
+            return select_benchmarks(*self.results_store(), benchmark_names)
+        return concat_dfs({name: self[name] for name in benchmark_names})
+
+    def concat(self, benchmark_names):
+        """Concatenate data frames of the given benchmarks (in the order of files), loading only those"""
+        return self._concat([name for name in self.files if name in benchmark_names])
+
+    @functools.cached_property
+    def df_normal(self):
+        return self.concat([name for name in self.files if name not in UNDERAPPROX_BENCHMARKS])
+
+    @functools.cached_property
+    def df_underapprox(self):
+        return self.concat([name for name in self.files if name in UNDERAPPROX_BENCHMARKS])
+
+    @functools.cached_property
+    def df_all(self):
+        normal = [name for name in self.files if name not in UNDERAPPROX_BENCHMARKS]
+        underapprox = [name for name in self.files if name in UNDERAPPROX_BENCHMARKS]
+        return self._concat(normal + underapprox)
+
+
+class InstanceTable:
+    """Table of instances, (benchmark, name), giving every instance an integer id
+
+    Results from different files, runs or timeouts are aligned by ids of their instances instead of by positions of
+    rows. Benchmarks and names are hashed once per distinct value (categories of their categorical columns) and rows
+    are matched by hashing ids, so aligning and joining data frames takes linear time. Ids stay the same while more
+    data frames are added to the table.
+    """
+
+    def __init__(self):
+        self.benchmarks = pd.Index([], dtype=object)
+        self.names = pd.Index([], dtype=object)
+        self.keys = pd.Index([], dtype=np.int64)  # benchmark code << 32 | name code of each id
+
+    @staticmethod
+    def _codes(index, values):
+        """index extended by values not in it yet and codes of values in it (-1 for missing values)"""
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            codes, uniques = pd.factorize(values)  # Not sorted, unlike categories of pd.Categorical()
+        uniques = pd.Index(uniques, dtype=object)
+        positions = index.get_indexer(uniques)
+        missing = positions < 0
+        positions[missing] = len(index) + np.arange(missing.sum())
+        return index.append(uniques[missing]), np.append(positions, -1)[codes]
+
+    def ids(self, df):
+        """Ids of instances of rows of df, adding new instances to the table, -1 for rows without benchmark or name"""
+        self.benchmarks, benchmark_codes = self._codes(self.benchmarks, df["benchmark"])
+        self.names, name_codes = self._codes(self.names, df["name"])
+        keys = np.where((benchmark_codes >= 0) & (name_codes >= 0),
+                        (benchmark_codes.astype(np.int64) << 32) | name_codes, -1)
+        ids = self.keys.get_indexer(keys)
+        new_keys = pd.unique(keys[(ids < 0) & (keys >= 0)])
+        if len(new_keys):
+            self.keys = self.keys.append(pd.Index(new_keys))
+            ids = self.keys.get_indexer(keys)
+        return ids
+
+    def rows(self, ids):
+        """Positions of rows with ids (of a data frame) by id, -1 for ids not present (of repeated ids the first row
+        is used)"""
+        first = np.flatnonzero((ids >= 0) & ~pd.Index(ids).duplicated())
+        rows = np.full(len(self.keys), -1)
+        rows[ids[first]] = first
+        return rows
+
+    def align(self, df_left, df_right):
+        """Positions of rows of the instances of both df_left and df_right, in df_left and in df_right"""
+        left_ids, right_ids = self.ids(df_left), self.ids(df_right)
+        left_rows, right_rows = self.rows(left_ids), self.rows(right_ids)
+        both = (left_rows >= 0) & (right_rows >= 0)
+        return left_rows[both], right_rows[both]
+
+    def index(self, ids):
+        """Index (benchmark, name) of instances of ids"""
+        keys = self.keys.to_numpy()[ids]
+        # Levels are the (unique) benchmarks and names of the table, from_arrays() would sort them
+        return pd.MultiIndex(levels=[self.benchmarks, self.names], codes=[keys >> 32, keys & 0xFFFFFFFF],
+                             names=["benchmark", "name"], verify_integrity=False)
+
+    def join(self, frames, how="outer"):
+        """Join data frames (a dict of labels to data frames) into one indexed by instances, (benchmark, name), with
+        columns (label, column of the data frame)
+
+        how is "outer" for instances of any data frame (missing values are NaN) or "inner" for instances of all.
+        """
+        frame_ids = {label: self.ids(df) for label, df in frames.items()}
+        frame_rows = {label: self.rows(ids) for label, ids in frame_ids.items()}
+        present = np.stack([rows >= 0 for rows in frame_rows.values()])
+        ids = np.flatnonzero(present.any(axis=0) if how == "outer" else present.all(axis=0))
+        # rows -1 of missing instances are not in the RangeIndex, reindex() fills them with NaN
+        columns = {label: df.drop(columns=["benchmark", "name"]).reset_index(drop=True).reindex(frame_rows[label][ids])
+                   .reset_index(drop=True) for label, df in frames.items()}
+        return pd.concat(columns, axis=1).set_axis(self.index(ids))
+
+
+def thin_curve(y, tolerance):
+    """Positions of points of curve y (over positions 0..len(y)-1) to keep so that linear interpolation between them
+    stays within tolerance of y everywhere (Ramer-Douglas-Peucker), the endpoints are always kept"""
+    keep = np.zeros(len(y), dtype=bool)
+    keep[[0, -1]] = len(y) > 0
+    segments = [(0, len(y) - 1)]
+    while segments:
+        first, last = segments.pop()
+        if last - first < 2:
+            continue
+        positions = np.arange(first + 1, last)
+        chord = y[first] + (y[last] - y[first]) * (positions - first) / (last - first)
+        deviation = np.abs(y[first + 1:last] - chord)
+        farthest = np.argmax(deviation)
+        if deviation[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            segments += [(first, split), (split, last)]
+    return np.flatnonzero(keep)
+
+
+def thin_cactus_plot(df, tolerance):
+    """Thins cumulative runtime series of a cactus plot to points needed to draw them within tolerance
+
+    Cactus plots have a logarithmic runtime axis, so tolerance is relative to the height of the plot in log10 of
+    cumulative runtimes (below TIME_MIN counted as TIME_MIN). The same data also draw plots with a linear runtime axis,
+    so points needed within tolerance of the largest cumulative runtime are kept too. Each series keeps its first and
+    last solved instance (so solved counts stay exact). Returns the rows of df (indexed by instance positions) kept
+    by any series, all values are the measured cumulative runtimes (NaN past the last solved instance of a series).
+    """
+    values = df.to_numpy(dtype=float)
+    log_values = np.log10(np.maximum(values, TIME_MIN))
+    linear_tolerance = tolerance * np.nanmax(values, initial=0.0)
+    drawn_log_values = log_values[~np.isnan(log_values)]
+    log_tolerance = tolerance * (np.ptp(drawn_log_values) if len(drawn_log_values) else 0.0)
+    kept = [np.zeros(0, dtype=int)]
+    for y, log_y in zip(values.T, log_values.T):
+        solved = np.count_nonzero(~np.isnan(y))  # Unsolved instances are sorted last.
+        kept += [thin_curve(log_y[:solved], log_tolerance), thin_curve(y[:solved], linear_tolerance)]
+    index = np.unique(np.concatenate(kept))
+    return pd.DataFrame(values[index], index=pd.Index(index, name="instances"), columns=df.columns)
+
+
+def cactus_plot_data_path(csv_file_name, output_format=None):
+    """Path of the cactus plot data written by generate_cactus_plot_csvs()"""
+    output_format = output_format or CACTUS_PLOT_FORMAT
+    return output_path("csvs", f"cactus_plot_{csv_file_name}.{output_format}")
 
 
 def generate_cactus_plot_csvs(dfs, tools_to_print: list[Tool], tools_for_virtual_best_solver: list[Tool],
                               benchmarks: list[Benchmark], csv_file_name: str,
-                              tools_for_virtual_best_solver_improvement: list[Tool] | None = None):
+                              tools_for_virtual_best_solver_improvement: list[Tool] | None = None,
+                              thin_tolerance: float | None = None, output_format: str | None = None):
+    """Generate data of a cactus plot, cumulative runtimes of tools (and virtual best solvers) sorted by runtime
+
+    With thin_tolerance (defaults to CACTUS_PLOT_THIN_TOLERANCE), series are thinned by thin_cactus_plot() and
+    written with an 'instances' column. output_format (defaults to CACTUS_PLOT_FORMAT) is 'csv' or 'parquet'
+    (compressed binary).
+    """
+    if thin_tolerance is None:
+        thin_tolerance = CACTUS_PLOT_THIN_TOLERANCE
+    output_format = output_format or CACTUS_PLOT_FORMAT
     new_dfs = {}
     benchmark_names = [benchmark.value for benchmark in benchmarks]
-    for benchmark, df in dfs.items():
+    for benchmark in dfs:
         if benchmark not in benchmark_names:
             continue
-        new_dfs[benchmark] = df
+        new_dfs[benchmark] = dfs[benchmark]
     dfs_all = pd.concat(new_dfs)
+    for col in dfs_all.columns:
+        if re.search(r"-runtime$", col):
+            dfs_all[col] = widen_runtimes(dfs_all[col])
 
     # Rename Noodler to Tool.
     for col in dfs_all.columns:
@@ -675,32 +2004,335 @@ def generate_cactus_plot_csvs(dfs, tools_to_print: list[Tool], tools_for_virtual
 
             dfs_tools.rename(columns={ col: col_split }, inplace=True)
 
-    dfs_tools.to_csv(f"csvs/cactus_plot_{csv_file_name}.csv", index=False)
+    if thin_tolerance:
+        dfs_tools = thin_cactus_plot(dfs_tools, thin_tolerance)
+
+    data_path = cactus_plot_data_path(csv_file_name, output_format)
+    if output_format == "parquet":
+        dfs_tools.to_parquet(data_path, index=bool(thin_tolerance), compression="zstd")
+    else:
+        dfs_tools.to_csv(data_path, index=bool(thin_tolerance))
 
     return dfs_tools
 
 
-def generate_requested_cactus_plots():
-    df_cactus = generate_cactus_plot_csvs(
-        dfs,
-        tools_to_print=[Tool.noodler_common, Tool.cvc5, Tool.z3, Tool.z3_str_re, Tool.z3_str_4],
-        tools_for_virtual_best_solver=[Tool.cvc5, Tool.z3, Tool.z3_str_re, Tool.z3_str_4],
-        tools_for_virtual_best_solver_improvement=[Tool.noodler_common],
-        benchmarks=Benchmark.items(),
-        csv_file_name="all_no_ostrich_trau_improvement_noodler")
-    generate_cactus_plot(df_cactus, "mult_virtual_all_no_ostrich_trau_improvement_noodler_start_26k_not_logarithmic", 26_000, 26_558, logarithmic_y_axis=False)
-    df_cactus = generate_cactus_plot_csvs(
-        dfs,
-        tools_to_print=[Tool.noodler_common, Tool.cvc5, Tool.z3, Tool.z3_str_re, Tool.z3_str_4],
-        tools_for_virtual_best_solver=[Tool.cvc5, Tool.z3, Tool.z3_str_re, Tool.z3_str_4],
-        tools_for_virtual_best_solver_improvement=[Tool.noodler_common],
-        benchmarks=[Benchmark.slog, Benchmark.slent, Benchmark.norn, Benchmark.leetcode, Benchmark.sygus_qgen],
-        csv_file_name="no_kaluza_no_ostrich_trau_improvement_noodler")
-    generate_cactus_plot(df_cactus, "mult_virtual_no_kaluza_no_ostrich_trau_improvement_noodler_start_6_8k_not_logarithmic", 6_600, 7_126, logarithmic_y_axis=False)
+def requested_cactus_plots():
+    """Cactus plots generated into csvs and graphs as pairs of generate_cactus_plot_csvs() and generate_cactus_plot()
+    arguments"""
+    return [
+        (dict(tools_to_print=[Tool.noodler_common, Tool.cvc5, Tool.z3, Tool.z3_str_re, Tool.z3_str_4],
+              tools_for_virtual_best_solver=[Tool.cvc5, Tool.z3, Tool.z3_str_re, Tool.z3_str_4],
+              tools_for_virtual_best_solver_improvement=[Tool.noodler_common],
+              benchmarks=Benchmark.items(),
+              csv_file_name="all_no_ostrich_trau_improvement_noodler"),
+         dict(file_name="mult_virtual_all_no_ostrich_trau_improvement_noodler_start_26k_not_logarithmic",
+              start=26_000, end=26_558, logarithmic_y_axis=False)),
+        (dict(tools_to_print=[Tool.noodler_common, Tool.cvc5, Tool.z3, Tool.z3_str_re, Tool.z3_str_4],
+              tools_for_virtual_best_solver=[Tool.cvc5, Tool.z3, Tool.z3_str_re, Tool.z3_str_4],
+              tools_for_virtual_best_solver_improvement=[Tool.noodler_common],
+              benchmarks=[Benchmark.slog, Benchmark.slent, Benchmark.norn, Benchmark.leetcode, Benchmark.sygus_qgen],
+              csv_file_name="no_kaluza_no_ostrich_trau_improvement_noodler"),
+         dict(file_name="mult_virtual_no_kaluza_no_ostrich_trau_improvement_noodler_start_6_8k_not_logarithmic",
+              start=6_600, end=7_126, logarithmic_y_axis=False)),
+    ]
+
+
+def generate_requested_cactus_plots(dfs, manifest=None, names=None):
+    """Generate CSVs and graphs of requested_cactus_plots(), with a manifest only those whose inputs changed
+
+    names selects cactus plots by their graph file names, all are generated when None.
+    """
+    for csv_params, plot_params in requested_cactus_plots():
+        if names is not None and plot_params['file_name'] not in names:
+            continue
+        target = f"cactus:{csv_params['csv_file_name']}:{plot_params['file_name']}"
+        if manifest is not None:
+            input_files = [dfs.files[benchmark.value] for benchmark in csv_params["benchmarks"]]
+            fingerprint = manifest.fingerprint(input_files, csv_params=csv_params, plot_params=plot_params,
+                                               **build_parameters(dfs))
+            if manifest.is_up_to_date(target, fingerprint):
+                continue
+
+        with instrumentation.labels(subset=csv_params['csv_file_name']):
+            with instrumentation.stage("generate_cactus_plot_csvs"):
+                df_cactus = generate_cactus_plot_csvs(dfs, **csv_params)
+            with instrumentation.stage("generate_cactus_plot", plot=plot_params['file_name']):
+                generate_cactus_plot(df_cactus, **plot_params)
+
+        if manifest is not None:
+            manifest.record(target, fingerprint, [cactus_plot_data_path(csv_params['csv_file_name']),
+                                                  output_path("graphs", f"fig-cactus-{plot_params['file_name']}.pdf"),
+                                                  output_path("graphs", f"fig-cactus-{plot_params['file_name']}-legend.pdf")])
+
+
+def virtual_best_solvers(df, tools, timeout_time=TIMEOUT):
+    """Evaluate virtual best solvers (VBS) of all non-empty subsets of tools
+
+    A VBS of a subset of tools solves an instance in the best runtime of its tools which solve it (return sat or
+    unsat). Runtimes of the 2^n subsets are computed incrementally in a depth-first order, each subset from the subset
+    without its last tool with a single np.fmin, so only n runtime vectors are held at once.
+
+    Returns a data frame with a row per subset: its tools, size, solved count and PAR-2 score (mean runtime, unsolved
+    instances count as 2 * timeout_time), followed by the marginal contribution of each tool in the subset to the solved
+    count ('<tool> solved') and PAR-2 score ('<tool> PAR-2'), i.e., the difference against the subset without the tool.
+    """
+    num_tools = len(tools)
+    runtimes = np.column_stack([np.where(df[f"{tool.value}-result"].isin(['sat', 'unsat']).to_numpy(),
+                                         widen_runtimes(df[f"{tool.value}-runtime"]).to_numpy(), np.inf)
+                                for tool in tools])
+    runtimes[np.isnan(runtimes)] = np.inf
+    num_instances = len(runtimes)
+    solved = np.zeros(1 << num_tools, dtype=np.int64)
+    par2 = np.full(1 << num_tools, 2.0 * timeout_time)
+
+    def visit(subset, last_tool, best_runtimes):
+        is_solved = np.isfinite(best_runtimes)
+        solved[subset] = np.count_nonzero(is_solved)
+        if num_instances > 0:
+            par2[subset] = (best_runtimes[is_solved].sum()
+                            + 2.0 * timeout_time * (num_instances - solved[subset])) / num_instances
+        for tool in range(last_tool + 1, num_tools):
+            visit(subset | (1 << tool), tool, np.fmin(best_runtimes, runtimes[:, tool]))
+
+    visit(0, -1, np.full(num_instances, np.inf))
+
+    subsets = np.arange(1, 1 << num_tools)
+    vbs = pd.DataFrame({
+        "tools": ['+'.join(tool.value for i, tool in enumerate(tools) if subset & (1 << i)) for subset in subsets],
+        "size": [bin(subset).count("1") for subset in subsets],
+        "solved": solved[subsets],
+        "PAR-2": par2[subsets],
+    })
+    for i, tool in enumerate(tools):
+        in_subset = (subsets & (1 << i)) != 0
+        without_tool = subsets ^ (1 << i)
+        vbs[f"{tool.value} solved"] = np.where(in_subset, solved[subsets] - solved[without_tool], np.nan)
+        vbs[f"{tool.value} PAR-2"] = np.where(in_subset, par2[subsets] - par2[without_tool], np.nan)
+    return vbs
+
+
+def gen_vbs_evaluation(df, tools, benchmark_name):
+    """Print and write the table of virtual best solvers of all subsets of tools, best first, with marginal
+    contributions of each tool to the solved count (+tool) and to the PAR-2 score (+tool PAR-2)"""
+    vbs = virtual_best_solvers(df, tools).sort_values(["solved", "PAR-2"], ascending=[False, True])
+    columns = (["tools", "size", "solved", "PAR-2"] + [f"{tool.value} solved" for tool in tools]
+               + [f"{tool.value} PAR-2" for tool in tools])
+    headers = (["tools", "size", "solved", "PAR-2"] + [f"+{tool.value}" for tool in tools]
+               + [f"+{tool.value} PAR-2" for tool in tools])
+    tab_vbs = vbs[columns].values.tolist()
+    return gen_table("Table VBS: " + benchmark_name, tab_vbs, headers, f"table-vbs-{benchmark_name}")
+
+
+def requested_vbs_evaluations():
+    """Virtual best solver evaluations generated into statistics and tables as (name, benchmarks, tools)"""
+    other_tools = [Tool.cvc5, Tool.z3, Tool.z3_str_re, Tool.z3_trau, Tool.z3_str_4, Tool.ostrich]
+    return [("all", Benchmark.values(), [Tool.noodler_common] + other_tools)]
+
+
+def gen_requested_vbs_evaluations(dfs, manifest=None):
+    """Generate virtual best solver tables of requested_vbs_evaluations(), with a manifest only those whose inputs
+    changed (printed tables of the others are replayed)"""
+    for name, benchmarks, tools in requested_vbs_evaluations():
+        target = f"vbs:{name}"
+        if manifest is not None:
+            input_files = [dfs.files[benchmark] for benchmark in benchmarks]
+            fingerprint = manifest.fingerprint(input_files, benchmarks=benchmarks, tools=tools, **build_parameters(dfs))
+            if manifest.is_up_to_date(target, fingerprint):
+                print(manifest.stdout(target), end="")
+                continue
+
+        with contextlib.redirect_stdout(io.StringIO()) as vbs_stdout, \
+                instrumentation.labels(subset=name), instrumentation.stage("gen_vbs_evaluation"):
+            outputs = gen_vbs_evaluation(dfs.concat(benchmarks), tools, name)
+        print(vbs_stdout.getvalue(), end="")
+
+        if manifest is not None:
+            manifest.record(target, fingerprint, outputs, vbs_stdout.getvalue())
+
+
+# A table/graph evaluation of a group of benchmarks.
+Evaluation = collections.namedtuple("Evaluation", ["name", "benchmarks", "main_tool", "tools"])
+
+
+def requested_evaluations():
+    """Evaluations generated into statistics, tables and scatter graphs"""
+    other_tools = [Tool.cvc5, Tool.z3, Tool.z3_str_re, Tool.z3_trau, Tool.z3_str_4, Tool.ostrich]
+    all_tools = [Tool.noodler] + other_tools
+    all_tools_common = [Tool.noodler_common] + other_tools
+    all_tools_underapprox = [Tool.noodler_underapprox] + other_tools
+    all_benchmarks = Benchmark.values()
+    normal_benchmarks = [benchmark for benchmark in all_benchmarks if benchmark not in UNDERAPPROX_BENCHMARKS]
+
+    evaluations = [
+        Evaluation("quick", [benchmark for benchmark in normal_benchmarks if benchmark not in ["leetcode"]],
+                   Tool.noodler, all_tools),
+        Evaluation("normal_all", normal_benchmarks, Tool.noodler, all_tools),
+        Evaluation("underapprox", UNDERAPPROX_BENCHMARKS, Tool.noodler_underapprox, all_tools_underapprox),
+    ]
+    for benchmark in all_benchmarks:
+        if benchmark in ["kaluza"]:
+            evaluations.append(Evaluation(benchmark + "_underapprox", [benchmark], Tool.noodler_underapprox,
+                                          all_tools_underapprox))
+        else:
+            evaluations.append(Evaluation(benchmark, [benchmark], Tool.noodler, all_tools))
+
+    evaluations.append(Evaluation("all", all_benchmarks, Tool.noodler_common, all_tools_common))
+
+    # Evaluate experiments for OSTRICH.
+    evaluations.append(Evaluation("all_ostrich", [benchmark for benchmark in all_benchmarks
+                                                  if benchmark not in [Benchmark.slog.value]],
+                                  Tool.noodler_common, [Tool.noodler_common, Tool.ostrich]))
+
+    # Evaluate experiments for Z3-trau.
+    evaluations.append(Evaluation("all_trau", [benchmark for benchmark in all_benchmarks
+                                               if benchmark not in ["norn", "slent"]],
+                                  Tool.noodler_common, all_tools_common))
+
+    return evaluations
+
+
+def gen_requested_evaluations(dfs, render_queue=None, manifest=None, evaluations=None, tables=True, scatter=True,
+                              statistics=None):
+    """Generate statistics, tables and scatter graphs of evaluations, requested_evaluations() by default
+
+    With a manifest, only evaluations whose inputs changed are regenerated (and only their benchmarks are loaded),
+    the printed statistics of the other evaluations are replayed from the manifest. tables and scatter select the
+    generated outputs as in gen_evaluation(), a manifest should be used only with both. Statistics of the evaluations
+    are collected in the statistics dict (if passed) as in gen_evaluation(). Regenerated evaluations are recorded in
+    the manifest only after render_queue rendered their scatter plots without errors.
+    """
+    if evaluations is None:
+        evaluations = requested_evaluations()
+    summary = wins = None
+    stale_evaluations = evaluations
+    fingerprints = {}
+    records = []  # Arguments of manifest.record() of regenerated evaluations.
+    if manifest is not None:
+        for evaluation in evaluations:
+            input_files = [dfs.files[benchmark] for benchmark in evaluation.benchmarks]
+            fingerprints[evaluation.name] = manifest.fingerprint(input_files, evaluation=evaluation,
+                                                                 **build_parameters(dfs))
+        stale_evaluations = [evaluation for evaluation in evaluations
+                             if not manifest.is_up_to_date(f"evaluation:{evaluation.name}",
+                                                           fingerprints[evaluation.name])
+                             or manifest.statistics(f"evaluation:{evaluation.name}") is None]
+
+    if stale_evaluations and tables:
+        stale_benchmarks = {benchmark for evaluation in stale_evaluations for benchmark in evaluation.benchmarks}
+        groups = {evaluation.name: (evaluation.benchmarks, evaluation.main_tool) for evaluation in stale_evaluations}
+        with instrumentation.stage("summary_statistics", groups=list(groups)):
+            summary = summary_statistics(dfs.concat(stale_benchmarks), groups)
+        with instrumentation.stage("win_matrices", groups=list(groups)):
+            wins = win_matrices(dfs.concat(stale_benchmarks), groups)
+
+    for evaluation in evaluations:
+        target = f"evaluation:{evaluation.name}"
+        if evaluation not in stale_evaluations:
+            print(manifest.stdout(target), end="")
+            if statistics is not None:
+                statistics[evaluation.name] = manifest.statistics(target)
+            continue
+
+        collected = {}
+        with contextlib.redirect_stdout(io.StringIO()) as evaluation_stdout, \
+                instrumentation.labels(subset=evaluation.name), instrumentation.stage("gen_evaluation"):
+            outputs = gen_evaluation(dfs.concat(evaluation.benchmarks), evaluation.main_tool, evaluation.tools,
+                                     benchmark_name=evaluation.name, render_queue=render_queue,
+                                     summary=None if summary is None else summary.loc[evaluation.name],
+                                     wins=None if wins is None else wins.loc[evaluation.name],
+                                     tables=tables, scatter=scatter, statistics=collected)
+        print(evaluation_stdout.getvalue(), end="")
+        if statistics is not None:
+            statistics.update(collected)
+        if manifest is not None:
+            records.append((target, fingerprints[evaluation.name], outputs, evaluation_stdout.getvalue(),
+                            collected.get(evaluation.name)))
+
+    if records and render_queue is not None:
+        # Raises errors of failed renders, their evaluations are not recorded and stay stale.
+        render_queue.wait()
+    for record in records:
+        manifest.record(*record)
+
+
+# Results of experiments read from <benchmark>/<data_file_name> of each benchmark and evaluated into their own
+# statistics file. With mask_unknown, runtimes of unknown results are masked as runtimes of errors and timeouts.
+# Evaluations None stand for requested_evaluations() with the requested cactus plots and virtual best solvers.
+ResultVariant = collections.namedtuple("ResultVariant", ["name", "data_file_name", "mask_unknown", "benchmarks",
+                                                         "statistics_file_name", "evaluations"])
+
+
+def requested_variants(names=None):
+    """Result variants evaluated by gen_variants(), only those of the given names (in the given order) if any"""
+    regex_tools = [Tool.noodler, Tool.z3, Tool.cvc5, Tool.z3_str_re, Tool.z3_str_4, Tool.ostrich]
+    variants = [
+        ResultVariant("to120", BENCHMARKS_DATA_FILE_NAME, False, Benchmark.values(), "statistics", None),
+        # Regex (non)membership experiments.
+        ResultVariant("regex", "to120_nonmembership.csv", True, ["regex"], "statistics_regex",
+                      [Evaluation("regex", ["regex"], Tool.noodler, regex_tools)]),
+    ]
+    if names is None:
+        return variants
+    variants = {variant.name: variant for variant in variants}
+    unknown = [name for name in names if name not in variants]
+    if unknown:
+        raise ValueError(f"Unknown result variants: {', '.join(unknown)}.")
+    return [variants[name] for name in names]
+
+
+def variant_dataset(variant, benchmarks_folder_path=BENCHMARKS_FOLDER_PATH):
+    """Lazily loaded results of a result variant"""
+    files = [benchmarks_folder_path / benchmark_name / variant.data_file_name for benchmark_name in variant.benchmarks]
+    return Dataset(files, Tool.noodler, Tool.noodler_underapprox, variant.mask_unknown)
+
+
+def gen_variant(variant, dfs=None, render_queue=None, manifest=None, jobs=1):
+    """Generate the statistics file (also as JSON and Parquet, see gen_statistics_files()), tables and graphs of a
+    result variant from dfs (variant_dataset() by default)"""
+    if dfs is None:
+        dfs = variant_dataset(variant)
+    if manifest is None:
+        dfs.load(jobs=jobs)
+        # Data frames of benchmarks are slices of df_all with a results store.
+        report_memory_usage([dfs.df_all] if dfs.store else [*dfs.values(), dfs.df_all])
+
+    with instrumentation.labels(variant=variant.name):
+        if manifest is None:
+            gen_sanity_report(dfs.df_all, variant.name)
+
+        if variant.evaluations is None:
+            # Generate CSVs for cactus plot.
+            generate_requested_cactus_plots(dfs, manifest)
+
+        # Generate statistics, tables and scatter graphs.
+        statistics = {}
+        with open(output_path(variant.statistics_file_name), "w+") as out_file, contextlib.redirect_stdout(out_file):
+            gen_requested_evaluations(dfs, render_queue, manifest, evaluations=variant.evaluations,
+                                      statistics=statistics)
+            if variant.evaluations is None:
+                gen_requested_vbs_evaluations(dfs, manifest)
+        gen_statistics_files(statistics, variant.statistics_file_name)
+
+
+def gen_variants(variants, manifest=None, jobs=1):
+    """Generate outputs of result variants one after another in this process
+
+    The variants share the worker processes rendering plots (and the read_file() caches), their statistics files
+    and other outputs are written side by side into OUTPUT_PATH.
+    """
+    with RenderQueue(jobs=jobs) as render_queue:
+        for variant in variants:
+            gen_variant(variant, render_queue=render_queue, manifest=manifest, jobs=jobs)
+
 
 def get_running_longer(df, tool: Tool, threshold: int = TIMEOUT, benchmarks: list[Benchmark] | None = None,
                        include_nan: bool = True):
-    """Filter instances running longer than threshold, optionally include NaN runtime values."""
+    """Filter instances running longer than threshold, optionally include NaN runtime values.
+
+    When df is a Dataset, only the files of the requested benchmarks are read.
+    """
+    if isinstance(df, Dataset):
+        df = df.concat([benchmark.value for benchmark in benchmarks]) if benchmarks else df.df_all
     if benchmarks:
         df = df.loc[df["benchmark"].isin([benchmark.value for benchmark in benchmarks])]
     df = df.loc[(df[f"{tool.value}-runtime"] >= threshold) | (include_nan & df[f"{tool.value}-runtime"].isnull())]
@@ -712,38 +2344,121 @@ def get_running_longer(df, tool: Tool, threshold: int = TIMEOUT, benchmarks: lis
 #df
 
 
+def read_build_results(files, mask_unknown=False):
+    """Reads result files of benchmarks into one data frame with a benchmark column, without z3-noodler-common
+    columns, e.g. results of a new build of Z3-Noodler in columns of another name"""
+    benchmark_dtype = pd.CategoricalDtype([file.parent.name for file in files])
+    dfs = {}
+    for file in files:
+        df = read_file(file, mask_unknown=mask_unknown)
+        df["benchmark"] = pd.Categorical([file.parent.name] * len(df), dtype=benchmark_dtype)
+        dfs[file.parent.name] = df
+    return concat_dfs(dfs)
+
+
+def regression_report(df_old, old_tool, df_new=None, new_tool=None, relative_threshold=REGRESSION_RELATIVE_THRESHOLD,
+                      absolute_threshold=REGRESSION_ABSOLUTE_THRESHOLD):
+    """Per-instance changes of results of new_tool in df_new against results of old_tool in df_old.
+
+    Tools are Tool members or tool names of result columns (e.g. of a new build). Without df_new, two tools of the same
+    results are compared, without new_tool, the same tool of two results. Instances are aligned by (benchmark, name).
+    A result flip is an instance solved (sat or unsat) by both with different results, a new timeout or lost solve
+    an instance solved only by old_tool where new_tool times out or returns unknown/an error, a new solve an instance
+    solved only by new_tool. A slowdown (speedup) is an instance solved by both where new_tool is slower (faster) by
+    more than absolute_threshold seconds and relative_threshold times the faster runtime.
+
+    Returns a data frame of changed instances with columns benchmark, name, old/new result and runtime, change (a
+    categorical of REGRESSION_CHANGES) and impact, the increase of runtime in seconds where unsolved instances take
+    TIMEOUT_VAL. Changes are ranked by kind (regressions first) and then by absolute impact.
+    """
+    old_tool = getattr(old_tool, "value", old_tool)
+    new_tool = old_tool if new_tool is None else getattr(new_tool, "value", new_tool)
+    df_new = df_old if df_new is None else df_new
+    rows_old, rows_new = InstanceTable().align(df_old, df_new)
+
+    result_old = pd.Categorical(df_old[f"{old_tool}-result"], dtype=RESULT_DTYPE).codes[rows_old]
+    result_new = pd.Categorical(df_new[f"{new_tool}-result"], dtype=RESULT_DTYPE).codes[rows_new]
+    runtime_old = widen_runtimes(df_old[f"{old_tool}-runtime"].to_numpy()[rows_old]).to_numpy()
+    runtime_new = widen_runtimes(df_new[f"{new_tool}-runtime"].to_numpy()[rows_new]).to_numpy()
+    solved_codes = RESULT_DTYPE.categories.get_indexer(['sat', 'unsat'])
+    solved_old = np.isin(result_old, solved_codes)
+    solved_new = np.isin(result_new, solved_codes)
+    time_old = np.where(solved_old, np.maximum(np.nan_to_num(runtime_old, nan=TIMEOUT_VAL), TIME_MIN), TIMEOUT_VAL)
+    time_new = np.where(solved_new, np.maximum(np.nan_to_num(runtime_new, nan=TIMEOUT_VAL), TIME_MIN), TIMEOUT_VAL)
+    impact = time_new - time_old
+    both_solved = solved_old & solved_new
+    conditions = [
+        both_solved & (result_old != result_new),
+        solved_old & (result_new == RESULT_DTYPE.categories.get_loc('TO')),
+        solved_old & ~solved_new,
+        both_solved & (impact > absolute_threshold) & (time_new > time_old * (1 + relative_threshold)),
+        both_solved & (-impact > absolute_threshold) & (time_old > time_new * (1 + relative_threshold)),
+        ~solved_old & solved_new,
+    ]
+    changes = np.select(conditions, range(len(REGRESSION_CHANGES)), default=-1)
+    changed = np.flatnonzero(changes >= 0)
+    changed = changed[np.lexsort((-np.abs(impact[changed]), changes[changed]))]
+
+    changed_old = df_old.iloc[rows_old[changed]]
+    return pd.DataFrame({
+        "benchmark": ordered_benchmarks(changed_old["benchmark"]),
+        "name": changed_old["name"].to_numpy(),
+        "result_old": pd.Categorical.from_codes(result_old[changed], dtype=RESULT_DTYPE),
+        "runtime_old": runtime_old[changed],
+        "result_new": pd.Categorical.from_codes(result_new[changed], dtype=RESULT_DTYPE),
+        "runtime_new": runtime_new[changed],
+        "change": pd.Categorical.from_codes(changes[changed], categories=REGRESSION_CHANGES),
+        "impact": impact[changed],
+    })
+
+
+def regression_summary(report):
+    """Numbers of changes of each kind per benchmark (with changes) of regression_report()"""
+    report = report.assign(benchmark=report["benchmark"].cat.remove_unused_categories())
+    summary = report.groupby(["benchmark", "change"], observed=False).size().unstack("change", fill_value=0)
+    summary = summary.reindex(columns=REGRESSION_CHANGES, fill_value=0)
+    summary.index = pd.Index(summary.index.astype(object), name="benchmark")
+    summary.loc["total"] = summary.sum()
+    return summary
+
+
+def gen_regression_report(report, name, top=REGRESSION_TOP):
+    """Print a summary of regression_report() with its top changes, write the summary table and all changes (CSV)"""
+    summary = regression_summary(report)
+    print("Regressions: " + name)
+    print(tab.tabulate(summary, headers="keys", tablefmt="github"))
+    print()
+    print(tab.tabulate(report.head(top), headers="keys", tablefmt="github", showindex=False))
+    print()
+    outputs = table_to_file(summary, ["benchmark"] + list(summary.columns), f"table-regressions-{name}")
+    outputs.append(output_path("csvs", f"regressions-{name}.csv"))
+    report.to_csv(outputs[-1], index=False)
+    return outputs
+
+
+dfs = Dataset(FILES, Tool.noodler, Tool.noodler_underapprox)
 
-dfs, df_all, df_normal, df_underapprox = create_dfs(FILES, Tool.noodler, Tool.noodler_underapprox)
+
+def __getattr__(name):
+    # Combined views of dfs are built on first access, see Dataset.
+    if name in ["df_all", "df_normal", "df_underapprox"]:
+        return getattr(dfs, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
-    # Generate CSVs for cactus plot.
-    generate_requested_cactus_plots()
-
-    # Generate statistics, tables and scatter graphs.
-    with open("statistics", "w+") as out_file:
-        out_stream = contextlib.redirect_stdout(out_file)
-
-        with out_stream:
-            other_tools = [Tool.cvc5, Tool.z3, Tool.z3_str_re, Tool.z3_trau, Tool.z3_str_4, Tool.ostrich]
-            all_tools = [Tool.noodler] + other_tools
-            all_tools_common = [Tool.noodler_common] + other_tools
-            all_tools_underapprox = [Tool.noodler_underapprox] + other_tools
-            gen_evaluation(df_normal.loc[~df_normal["benchmark"].isin(["leetcode"])], Tool.noodler, all_tools, benchmark_name="quick")
-            gen_evaluation(df_normal, Tool.noodler, all_tools, benchmark_name="normal_all")
-            gen_evaluation(df_underapprox, Tool.noodler_underapprox, all_tools_underapprox, benchmark_name="underapprox")
-            for benchmark in Benchmark.values():
-                if benchmark in ["kaluza"]:
-                    gen_evaluation(dfs[benchmark], Tool.noodler_underapprox, all_tools_underapprox, benchmark_name=benchmark + "_underapprox")
-                elif benchmark in ["leetcode"]:
-                    gen_evaluation(dfs[benchmark], Tool.noodler, all_tools, benchmark_name=benchmark)
-                else:
-                    gen_evaluation(dfs[benchmark], Tool.noodler, all_tools, benchmark_name=benchmark)
-
-            gen_evaluation(df_all, Tool.noodler_common, all_tools_common, benchmark_name="all")
-
-            # Evaluate experiments for OSTRICH.
-            gen_evaluation(df_all.loc[~df_all["benchmark"].isin([Benchmark.slog.value])], Tool.noodler_common, [Tool.noodler_common, Tool.ostrich], benchmark_name="all_ostrich")
-
-            # Evaluate experiments for Z3-trau.
-            gen_evaluation(df_all.loc[~df_all["benchmark"].isin(["norn", "slent"])], Tool.noodler_common, all_tools_common, benchmark_name="all_trau")
+    if INSTRUMENTATION_REPORT is not None:
+        instrumentation.start()
+    manifest = None
+    if INCREMENTAL_BUILD:
+        manifest = BuildManifest(OUTPUT_PATH / BUILD_MANIFEST_PATH)
+
+    gen_variants(requested_variants(RESULT_VARIANTS), manifest, jobs=JOBS)
+
+    if manifest is not None:
+        manifest.save()
+
+    if instrumentation.enabled:
+        instrumentation.stop()
+        instrumentation.save_report(INSTRUMENTATION_REPORT)
+        print(instrumentation.summary())
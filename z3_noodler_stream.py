@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+"""z3_noodler_stream.py
+
+Generate tables for Z3-Noodler experiments from result files too large to be loaded at once.
+
+Result files are read in chunks and the statistics of gen_evaluation() are computed with mergeable running aggregates,
+so the memory used is bounded by the chunk size, not by the size of the result files.
+
+In watch mode (see watch_evaluations()), result files that are still being appended to by a running campaign are
+tailed: only rows appended since the last refresh are parsed and added to the aggregates.
+"""
+
+from z3_noodler_eval import *
+
+STREAM_CHUNK_SIZE = 100_000  # Rows of a result file read at once.
+WATCH_INTERVAL = 60  # Seconds between refreshes of watched statistics.
+WATCH_BLOCK_SIZE = 1 << 26  # Bytes of appended rows read at once.
+WATCH_STATISTICS_FILE_NAME = "statistics_watch"
+WATCH_TABLES_FOLDER = "tables_watch"  # Tables of watched (partial) results, not to overwrite those in tables/.
+
+
+def read_file_chunks(filename, chunksize=STREAM_CHUNK_SIZE):
+    """Reads a CSV file in normalized chunks of at most chunksize rows"""
+    with pd.read_csv(filename, sep=";", comment="#", chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield normalize_frame(chunk)
+
+
+class ResultFileTail:
+    """Reader of rows appended to a result file since it was last read
+
+    Reading continues at the byte offset where the last read stopped and only complete lines are parsed, a line still
+    being written is left for the next read. The header (the first line which is not a comment) is kept to parse the
+    appended rows. With mask_unknown, runtimes of unknown results are masked as in read_file().
+    """
+
+    def __init__(self, filename, mask_unknown=False):
+        self.filename = pathlib.Path(filename)
+        self.mask_unknown = mask_unknown
+        self.file_id = None
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.header = None
+
+    def rewound(self):
+        """Whether the file shrank or was replaced since the last read, it is then read again from its start"""
+        try:
+            stat = self.filename.stat()
+        except FileNotFoundError:
+            return False
+        file_id = (stat.st_dev, stat.st_ino)
+        rewound = stat.st_size < self.offset or (self.file_id is not None and file_id != self.file_id)
+        self.file_id = file_id
+        if rewound:
+            self.reset()
+        return rewound
+
+    def read_new(self, chunksize=STREAM_CHUNK_SIZE, block_size=WATCH_BLOCK_SIZE):
+        """Normalized chunks of at most chunksize rows appended since the last read"""
+        with contextlib.suppress(FileNotFoundError), open(self.filename, "rb") as fl:
+            fl.seek(self.offset)
+            pending = b""
+            while block := fl.read(block_size):
+                lines = pending + block
+                complete = lines.rfind(b"\n") + 1
+                pending = lines[complete:]
+                self.offset += complete
+                yield from self._parse(lines[:complete], chunksize)
+
+    def _parse(self, lines, chunksize):
+        while lines and self.header is None:
+            line_end = lines.find(b"\n") + 1
+            line, lines = lines[:line_end], lines[line_end:]
+            if line.strip() and not line.lstrip().startswith(b"#"):
+                self.header = line
+        if not lines:
+            return
+        with pd.read_csv(io.BytesIO(self.header + lines), sep=";", comment="#", chunksize=chunksize) as reader:
+            for chunk in reader:
+                if len(chunk):
+                    yield normalize_frame(chunk, self.mask_unknown)
+
+
+class StreamingEvaluation:
+    """Running aggregates of Table 1, basic time and Table 2 statistics of a main tool and other tools
+
+    Like gen_evaluation(), timeouts, errors and unknowns are counted over all instances, while runtime statistics and
+    wins/loses skip instances where the main tool returns unknown. Aggregates of disjoint parts of results (chunks,
+    benchmarks) can be merged.
+    """
+
+    def __init__(self, main_tool, tools):
+        self.main_tool = main_tool
+        self.tools = list(tools)
+        self.formulae = 0
+        self.result_counts = np.zeros((len(self.tools), len(RESULT_DTYPE.categories)), dtype=np.int64)
+        self.runtime_stats = RunningStats(len(self.tools))
+        self.histogram = RuntimeHistogram(len(self.tools))
+        # Wins, wins-timeouts, loses and loses-timeouts of the main tool against each tool.
+        self.wins = np.zeros((len(self.tools), 4), dtype=np.int64)
+
+    def update(self, df):
+        """Add a chunk of normalized results"""
+        num_tools = len(self.tools)
+        num_results = len(RESULT_DTYPE.categories)
+        self.formulae += len(df)
+        result_codes = np.column_stack([df[f"{tool.value}-result"].cat.codes for tool in self.tools])
+        counts_index = np.arange(num_tools) * num_results + result_codes
+        self.result_counts += np.bincount(counts_index[result_codes >= 0],
+                                          minlength=num_tools * num_results).reshape(num_tools, num_results)
+
+        # Remove unknowns
+        main_tool_known = result_codes[:, self.tools.index(self.main_tool)] != RESULT_DTYPE.categories.get_loc('unknown')
+        runtimes = np.column_stack([widen_runtimes(df[f"{tool.value}-runtime"]).to_numpy()
+                                    for tool in self.tools])[main_tool_known]
+        self.runtime_stats.update(runtimes)
+        self.histogram.update(runtimes)
+
+        # comparing wins/loses on sanitized runtimes
+        runtimes = np.maximum(np.where(np.isnan(runtimes), TIMEOUT_VAL, runtimes), TIME_MIN)
+        main_runtimes = runtimes[:, [self.tools.index(self.main_tool)]]
+        main_wins = main_runtimes < runtimes
+        main_loses = main_runtimes > runtimes
+        self.wins += np.column_stack([main_wins.sum(axis=0), (main_wins & (runtimes == TIMEOUT_VAL)).sum(axis=0),
+                                      main_loses.sum(axis=0), (main_loses & (main_runtimes == TIMEOUT_VAL)).sum(axis=0)])
+
+    def merge(self, other):
+        assert self.main_tool == other.main_tool and self.tools == other.tools
+        self.formulae += other.formulae
+        self.result_counts += other.result_counts
+        self.runtime_stats.merge(other.runtime_stats)
+        self.histogram.merge(other.histogram)
+        self.wins += other.wins
+
+    def summary(self, timeout_time=TIMEOUT):
+        """Summary statistics indexed by tool names, with the columns of summary_statistics()"""
+        stats = self.runtime_stats.statistics()
+        timeouts = self.result_counts[:, RESULT_DTYPE.categories.get_loc('TO')].astype(float)
+        quantiles = self.histogram.quantiles(list(SUMMARY_QUANTILES.values()))
+        return pd.DataFrame({
+            "sum": stats["sum"],
+            "sum_with_timeouts": stats["sum"] + timeout_time * timeouts,
+            "max": stats["max"],
+            "min": stats["min"],
+            "mean": stats["mean"],
+            **{name: quantiles[:, i] for i, name in enumerate(SUMMARY_QUANTILES)},
+            "std": stats["std"],
+            "timeouts": timeouts,
+            "errors": self.result_counts[:, RESULT_DTYPE.categories.get_loc('ERR')].astype(float),
+            "unknowns": self.result_counts[:, RESULT_DTYPE.categories.get_loc('unknown')].astype(float),
+        }, index=pd.Index([tool.value for tool in self.tools], name="tool"))
+
+    def tab_wins(self, tools):
+        """Rows of Table 2 for tools other than the main tool"""
+        return [[tool.value, *self.wins[self.tools.index(tool)].tolist()] for tool in tools if tool != self.main_tool]
+
+    def win_rows(self):
+        """Wins and loses of the main tool as rows of win_matrices() indexed by (tool name, opponent name)"""
+        index = pd.MultiIndex.from_product([[self.main_tool.value], [tool.value for tool in self.tools]],
+                                           names=["tool", "opponent"])
+        return pd.DataFrame(self.wins, index=index, columns=["wins", "wins_timeouts", "loses", "loses_timeouts"])
+
+
+def tools_by_main_tool(evaluations):
+    """Tools of evaluations by their main tool (the main tool first), tools of one StreamingEvaluation each"""
+    tools_by_main_tool = {}
+    for evaluation in evaluations:
+        tools = tools_by_main_tool.setdefault(evaluation.main_tool, [evaluation.main_tool])
+        tools.extend(tool for tool in evaluation.tools if tool not in tools)
+    return tools_by_main_tool
+
+
+def benchmark_aggregates(main_tools):
+    """Empty StreamingEvaluation of a benchmark for each main tool of main_tools (as of tools_by_main_tool())"""
+    return {main_tool: StreamingEvaluation(main_tool, tools) for main_tool, tools in main_tools.items()}
+
+
+def merge_benchmark_aggregates(aggregates, evaluations, main_tools):
+    """Merge aggregates of benchmarks (dicts from benchmark_aggregates()) into aggregates of evaluations
+
+    Returns a dict from evaluation names to their StreamingEvaluation.
+    """
+    evaluation_aggregates = {}
+    for evaluation in evaluations:
+        aggregate = StreamingEvaluation(evaluation.main_tool, main_tools[evaluation.main_tool])
+        for benchmark in evaluation.benchmarks:
+            aggregate.merge(aggregates[benchmark][evaluation.main_tool])
+        evaluation_aggregates[evaluation.name] = aggregate
+    return evaluation_aggregates
+
+
+def stream_evaluations(files, evaluations, noodler_version, noodler_underapprox_version, chunksize=STREAM_CHUNK_SIZE):
+    """Aggregate evaluations reading each file once in chunks
+
+    Each benchmark gets one StreamingEvaluation per main tool, these are merged into the aggregates of evaluations.
+    Returns a dict from evaluation names to their StreamingEvaluation.
+    """
+    main_tools = tools_by_main_tool(evaluations)
+    files = {file.parent.name: file for file in files}
+    needed_benchmarks = {benchmark for evaluation in evaluations for benchmark in evaluation.benchmarks}
+    aggregates = {}
+    for benchmark_name, file in files.items():
+        if benchmark_name not in needed_benchmarks:
+            continue
+        aggregates[benchmark_name] = benchmark_aggregates(main_tools)
+        for chunk in read_file_chunks(file, chunksize):
+            add_benchmark_columns(chunk, benchmark_name, noodler_version, noodler_underapprox_version)
+            for aggregate in aggregates[benchmark_name].values():
+                aggregate.update(chunk)
+
+    return merge_benchmark_aggregates(aggregates, evaluations, main_tools)
+
+
+class WatchedEvaluations:
+    """Aggregates of evaluations kept up to date with rows appended to result files
+
+    The file of each benchmark is tailed by a ResultFileTail, rows appended since the last poll are added to the
+    StreamingEvaluation of the benchmark for each main tool, so a poll costs time proportional to the new rows. A
+    benchmark whose file shrank or was replaced is aggregated again from the start of its file. With mask_unknown,
+    runtimes of unknown results are masked as in read_file().
+    """
+
+    def __init__(self, files, evaluations, noodler_version, noodler_underapprox_version, mask_unknown=False):
+        self.evaluations = evaluations
+        self.noodler_version = noodler_version
+        self.noodler_underapprox_version = noodler_underapprox_version
+        self.main_tools = tools_by_main_tool(evaluations)
+        needed_benchmarks = {benchmark for evaluation in evaluations for benchmark in evaluation.benchmarks}
+        self.tails = {file.parent.name: ResultFileTail(file, mask_unknown) for file in files
+                      if file.parent.name in needed_benchmarks}
+        self.benchmark_aggregates = {benchmark_name: benchmark_aggregates(self.main_tools)
+                                     for benchmark_name in self.tails}
+
+    def poll(self, chunksize=STREAM_CHUNK_SIZE):
+        """Add rows appended to the files since the last poll, returns the number of added rows"""
+        new_rows = 0
+        for benchmark_name, tail in self.tails.items():
+            if tail.rewound():
+                self.benchmark_aggregates[benchmark_name] = benchmark_aggregates(self.main_tools)
+            for chunk in tail.read_new(chunksize):
+                add_benchmark_columns(chunk, benchmark_name, self.noodler_version, self.noodler_underapprox_version)
+                for aggregate in self.benchmark_aggregates[benchmark_name].values():
+                    aggregate.update(chunk)
+                new_rows += len(chunk)
+        return new_rows
+
+    def aggregates(self):
+        """Current aggregates of the evaluations, a dict from evaluation names to their StreamingEvaluation"""
+        return merge_benchmark_aggregates(self.benchmark_aggregates, self.evaluations, self.main_tools)
+
+
+def gen_streaming_evaluation(aggregate, all_tools, benchmark_name, timeout_time=120, statistics=None,
+                             tables_folder="tables"):
+    """Print and write the tables of gen_evaluation() from a StreamingEvaluation (no scatter plots) to tables_folder
+
+    evaluation_statistics() of the evaluation are added to the statistics dict (if passed) under benchmark_name.
+    """
+    print(f"Benchmark: {benchmark_name}")
+    print(f"# of formulae: {aggregate.formulae}")
+    summary = aggregate.summary(timeout_time)
+    outputs = gen_summary_tables(summary, all_tools, benchmark_name, tables_folder)
+    outputs.extend(gen_wins_table(aggregate.tab_wins(all_tools), benchmark_name, tables_folder))
+    if statistics is not None:
+        statistics[benchmark_name] = evaluation_statistics(summary, aggregate.win_rows(), aggregate.main_tool,
+                                                           all_tools)
+    return outputs
+
+
+def watch_evaluations(watched, interval=WATCH_INTERVAL, refreshes=None,
+                      statistics_file_name=WATCH_STATISTICS_FILE_NAME, tables_folder=WATCH_TABLES_FOLDER):
+    """Poll WatchedEvaluations every interval seconds and refresh their statistics file (also as JSON and Parquet) and
+    tables in tables_folder whenever rows were added, until interrupted or for refreshes polls"""
+    pathlib.Path(output_path(tables_folder)).mkdir(parents=True, exist_ok=True)
+    polls = 0
+    total_rows = 0
+    while refreshes is None or polls < refreshes:
+        start = time.perf_counter()
+        new_rows = watched.poll()
+        total_rows += new_rows
+        polls += 1
+        if new_rows or polls == 1:
+            aggregates = watched.aggregates()
+            statistics = {}
+            with open(output_path(statistics_file_name), "w+") as out_file, contextlib.redirect_stdout(out_file):
+                for evaluation in watched.evaluations:
+                    gen_streaming_evaluation(aggregates[evaluation.name], evaluation.tools, evaluation.name,
+                                             statistics=statistics, tables_folder=tables_folder)
+            gen_statistics_files(statistics, statistics_file_name)
+        print(f"{datetime.datetime.now():%H:%M:%S} {new_rows} new rows ({total_rows} in total), refreshed in "
+              f"{time.perf_counter() - start:.2f} s", file=sys.stderr)
+        if refreshes is None or polls < refreshes:
+            time.sleep(max(0.0, interval - (time.perf_counter() - start)))
+
+
+if __name__ == "__main__":
+    with open(output_path("statistics"), "w+") as out_file:
+        with contextlib.redirect_stdout(out_file):
+            evaluations = requested_evaluations()
+            aggregates = stream_evaluations(FILES, evaluations, Tool.noodler, Tool.noodler_underapprox)
+            for evaluation in evaluations:
+                gen_streaming_evaluation(aggregates[evaluation.name], evaluation.tools, evaluation.name)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""z3_noodler_synthetic.py
+
+Generate synthetic result files in the schema of read_file() for measuring the analysis code without real results.
+
+Each instance has a hidden difficulty and a status (sat or unsat). Runtimes of all tools follow the difficulty scaled
+by a per-tool speed with per-instance noise, so tools are correlated as in real experiments. Runtimes over TIMEOUT
+become timeouts, and a small share of results are unknown or errors (some with raw error messages).
+"""
+
+import argparse
+
+from z3_noodler_eval import *
+
+# Share of instances with status sat (the rest is unsat).
+SYNTHETIC_SAT_RATIO = 0.55
+# Probabilities that a tool answers unknown or fails with an error on an instance it does not time out on.
+SYNTHETIC_UNKNOWN_RATE = 0.03
+SYNTHETIC_ERROR_RATE = 0.02
+# Instance difficulty is log-normal with these parameters of log10(runtime).
+SYNTHETIC_DIFFICULTY_MEAN = -0.5
+SYNTHETIC_DIFFICULTY_STD = 1.0
+# Tools of real experiments, except z3-noodler-common which is derived when loading.
+SYNTHETIC_TOOLS = [tool.value for tool in Tool if tool != Tool.noodler_common]
+
+
+def synthetic_tools(num_tools):
+    """Names of num_tools tools, the tools of real experiments first, then solver-NN"""
+    extra = [f"solver-{i:02}" for i in range(max(0, num_tools - len(SYNTHETIC_TOOLS)))]
+    return (SYNTHETIC_TOOLS + extra)[:num_tools]
+
+
+def synthetic_results(num_instances, tools, benchmark_name="synthetic", seed=0):
+    """Raw results of tools on num_instances instances as read from a result file (strings with padding)"""
+    rng = np.random.default_rng(seed)
+    difficulty = rng.normal(SYNTHETIC_DIFFICULTY_MEAN, SYNTHETIC_DIFFICULTY_STD, num_instances)
+    status = np.where(rng.random(num_instances) < SYNTHETIC_SAT_RATIO, "sat", "unsat")
+
+    columns = {"name": [f"{benchmark_name}/inst{i}.smt2" for i in range(num_instances)]}
+    for tool in tools:
+        speed = rng.normal(0, 0.3)
+        runtimes = 10 ** (difficulty + speed + rng.normal(0, 0.4, num_instances))
+        outcome = rng.random(num_instances)
+        results = status.astype(object)
+        results[outcome < SYNTHETIC_UNKNOWN_RATE + SYNTHETIC_ERROR_RATE] = "unknown"
+        errors = outcome < SYNTHETIC_ERROR_RATE
+        results[errors] = np.where(outcome[errors] < SYNTHETIC_ERROR_RATE / 2, "ERR", "error: out of memory")
+        timeouts = runtimes > TIMEOUT
+        results[timeouts] = "TO"
+        runtimes = np.round(np.minimum(runtimes, TIMEOUT), 2)
+
+        # Timeouts sometimes have no runtime at all.
+        runtimes = np.where(timeouts & (rng.random(num_instances) < 0.5), np.nan, runtimes)
+        columns[f"{tool}-result"] = " " + results + " "
+        columns[f"{tool}-runtime"] = runtimes
+    return pd.DataFrame(columns)
+
+
+def write_results(df, filename):
+    """Write raw results to a result file read by read_file()"""
+    pathlib.Path(filename).parent.mkdir(parents=True, exist_ok=True)
+    with open(filename, "w") as results_file:
+        print("# synthetic results", file=results_file)
+        df.to_csv(results_file, sep=";", index=False, float_format="%.2f")
+
+
+def generate_benchmarks(folder, num_instances, num_tools, data_file_name=BENCHMARKS_DATA_FILE_NAME, seed=0):
+    """Write result files of all benchmarks into folder/<benchmark>/data_file_name, num_instances split evenly
+
+    Returns the list of written files in the order of Benchmark.
+    """
+    tools = synthetic_tools(num_tools)
+    benchmarks = Benchmark.values()
+    files = []
+    for i, benchmark_name in enumerate(benchmarks):
+        size = num_instances // len(benchmarks) + (i < num_instances % len(benchmarks))
+        file = pathlib.Path(folder) / benchmark_name / data_file_name
+        write_results(synthetic_results(size, tools, benchmark_name, seed + i), file)
+        files.append(file)
+    return files
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic result files of all benchmarks.")
+    parser.add_argument("folder", type=pathlib.Path, help="folder to write <benchmark>/<data file> into")
+    parser.add_argument("--instances", type=int, default=27_000, help="number of instances (default: %(default)s)")
+    parser.add_argument("--tools", type=int, default=len(SYNTHETIC_TOOLS),
+                        help="number of tools, at least the %(default)s tools of real experiments")
+    parser.add_argument("--data-file", default=BENCHMARKS_DATA_FILE_NAME,
+                        help="name of the result file of each benchmark (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: %(default)s)")
+    args = parser.parse_args()
+    if args.tools < len(SYNTHETIC_TOOLS):
+        parser.error(f"--tools must be at least {len(SYNTHETIC_TOOLS)}")
+    for file in generate_benchmarks(args.folder, args.instances, args.tools, args.data_file, args.seed):
+        print(file)